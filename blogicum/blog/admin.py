@@ -2,6 +2,7 @@ from django.contrib import admin
 from .models import Post, Category, Location
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import Group
+from search.backends import get_backend
 # Register your models here.
 
 admin.site.unregister(Group)
@@ -26,6 +27,13 @@ class PostAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # search_fields нужны только для показа строки поиска:
+        # ищем по индексу, а не LIKE по всей таблице.
+        if not search_term.strip():
+            return queryset, False
+        return get_backend().search(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -0,0 +1,164 @@
+"""Потоковая пакетная загрузка фикстур в формате dumpdata.
+
+В отличие от loaddata файл не читается целиком, а объекты
+записываются пачками многострочными INSERT, без сигналов и save()
+для каждой строки.
+"""
+import gzip
+import json
+from collections import Counter, defaultdict
+
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.constants import OnConflict
+
+CHUNK_SIZE = 1 << 16
+# Между объектами верхнего уровня: пробелы, запятые и скобки массива.
+SEPARATORS = ' \t\r\n,[]'
+
+
+def open_fixture(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_objects(stream, chunk_size=CHUNK_SIZE):
+    """Объекты фикстуры по одному по мере чтения потока.
+
+    Понимает и массив JSON (dumpdata --format json), и объекты
+    по одному в строке (JSONL). В памяти держится только
+    недочитанный хвост буфера.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    while True:
+        while position < len(buffer) and buffer[position] in SEPARATORS:
+            position += 1
+        if position < len(buffer):
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield obj
+                continue
+        elif eof:
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+
+def insert_raw(model, objs, using=DEFAULT_DB_ALIAS):
+    """Вставляет объекты с заданными первичными ключами пачками.
+
+    Как save(raw=True) в loaddata: значения записываются без pre_save,
+    иначе auto_now_add перезапишет даты создания; публичный bulk_create
+    такого режима не имеет. Строки с существующим ключом обновляются.
+    """
+    if not objs:
+        return
+    opts = model._meta
+    connection = connections[using]
+    fields = [field for field in opts.concrete_fields if not field.generated]
+    update_fields = [field for field in fields if not field.primary_key]
+    options = {}
+    features = connection.features
+    if update_fields and features.supports_update_conflicts_with_target:
+        options = {
+            'on_conflict': OnConflict.UPDATE,
+            'update_fields': update_fields,
+            'unique_fields': [opts.pk],
+        }
+    manager = model._base_manager.using(using)
+    size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), size):
+        manager._insert(
+            objs[start:start + size],
+            fields=fields,
+            raw=True,
+            using=using,
+            **options,
+        )
+
+
+class BulkLoader:
+    """Копит десериализованные объекты и сохраняет их пачками.
+
+    Существующие строки с тем же первичным ключом обновляются, как
+    при loaddata. Проверку внешних ключей вызывающий откладывает
+    до конца загрузки (constraint_checks_disabled).
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=1000,
+                 ignorenonexistent=False, on_flush=None):
+        self.using = using
+        self.batch_size = batch_size
+        self.ignorenonexistent = ignorenonexistent
+        self.on_flush = on_flush
+        self.pending = defaultdict(list)
+        self.deferred = []
+        self.counts = Counter()
+
+    def load(self, objects):
+        for deserialized in Deserializer(
+            objects,
+            using=self.using,
+            ignorenonexistent=self.ignorenonexistent,
+            handle_forward_references=True,
+        ):
+            model = type(deserialized.object)
+            batch = self.pending[model]
+            batch.append(deserialized)
+            if len(batch) >= self.batch_size:
+                self.flush(model)
+
+    def finish(self):
+        for model in list(self.pending):
+            self.flush(model)
+        for deserialized in self.deferred:
+            deserialized.save_deferred_fields(using=self.using)
+        self.deferred.clear()
+
+    def flush(self, model):
+        batch = self.pending.pop(model, [])
+        if not batch:
+            return
+        if model._meta.parents:
+            # bulk_create не умеет наследование с несколькими таблицами.
+            single = batch
+        else:
+            # Без первичного ключа после вставки не добавить связи m2m.
+            single = [item for item in batch if item.object.pk is None]
+            insert_raw(
+                model,
+                [item.object for item in batch if item.object.pk is not None],
+                using=self.using,
+            )
+        for deserialized in single:
+            deserialized.save(using=self.using)
+        self._add_m2m(model, batch)
+        self.deferred.extend(item for item in batch if item.deferred_fields)
+        self.counts[model] += len(batch)
+        if self.on_flush:
+            self.on_flush(model, len(batch))
+
+    def _add_m2m(self, model, batch):
+        rows = defaultdict(list)
+        for deserialized in batch:
+            for name, values in (deserialized.m2m_data or {}).items():
+                field = model._meta.get_field(name)
+                through = field.remote_field.through
+                source = f'{field.m2m_field_name()}_id'
+                target = f'{field.m2m_reverse_field_name()}_id'
+                rows[through].extend(
+                    through(**{source: deserialized.object.pk,
+                               target: value})
+                    for value in values
+                )
+        for through, objs in rows.items():
+            through._base_manager.using(self.using).bulk_create(
+                objs, batch_size=self.batch_size, ignore_conflicts=True
+            )
@@ -0,0 +1,132 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .scheduling import limit_timeout
+
+FEED_COUNT_PREFIX = 'blog:feed-count'
+FEED_GENERATION_KEY = 'blog:feed-generation'
+
+# Идентификаторы лент: 'home', 'category:<id>', 'author:<id>:<scope>'.
+
+
+def home_feed():
+    return 'home'
+
+
+def category_feed(category_id):
+    return f'category:{category_id}'
+
+
+def author_feed(author_id, with_hidden=False):
+    return f'author:{author_id}:{"all" if with_hidden else "published"}'
+
+
+def feeds_for_post(category_id, author_id):
+    return [
+        home_feed(),
+        category_feed(category_id),
+        author_feed(author_id),
+        author_feed(author_id, with_hidden=True),
+    ]
+
+
+def feed_generation():
+    return cache.get_or_set(FEED_GENERATION_KEY, 1, None)
+
+
+def feed_count_key(feed):
+    return f'{FEED_COUNT_PREFIX}:{feed_generation()}:{feed}'
+
+
+def feed_count_timeout(feed):
+    return limit_timeout(
+        getattr(settings, 'BLOG_FEED_COUNT_TIMEOUT', 60), feed
+    )
+
+
+def invalidate_feed_counts(feeds):
+    cache.delete_many([feed_count_key(feed) for feed in feeds])
+
+
+def invalidate_all_feed_counts():
+    """Сбрасывает счётчики всех лент разом, сменой поколения ключей."""
+    try:
+        cache.incr(FEED_GENERATION_KEY)
+    except ValueError:
+        cache.set(FEED_GENERATION_KEY, 2, None)
+
+
+PAGE_PREFIX = 'blog:page'
+PAGE_TAG_PREFIX = 'blog:page-tag'
+ALL_PAGES = 'all'
+
+
+def home_page_tag():
+    return 'home'
+
+
+def category_page_tag(slug):
+    return f'category:{slug}'
+
+
+def author_page_tag(username):
+    return f'author:{username}'
+
+
+def post_page_tag(post_id):
+    return f'post:{post_id}'
+
+
+def page_tags_for_post(post_id, category_slug, username):
+    return [
+        home_page_tag(),
+        category_page_tag(category_slug),
+        author_page_tag(username),
+        post_page_tag(post_id),
+    ]
+
+
+def _page_tag_keys(tags):
+    return [f'{PAGE_TAG_PREFIX}:{tag}' for tag in (ALL_PAGES, *tags)]
+
+
+def page_cache_key(path, tags):
+    """Ключ страницы зависит от текущих версий всех её тегов.
+
+    Инвалидация тега меняет его версию, и все страницы с этим тегом
+    перестают находиться в кэше без перебора самих страниц.
+    """
+    tag_keys = _page_tag_keys(tags)
+    versions = cache.get_many(tag_keys)
+    missing = [key for key in tag_keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid4().hex, None)
+        versions = cache.get_many(tag_keys)
+    signature = '|'.join(str(versions.get(key)) for key in tag_keys)
+    digest = md5(f'{path}|{signature}'.encode()).hexdigest()
+    return f'{PAGE_PREFIX}:{digest}'
+
+
+def invalidate_pages(tags):
+    cache.set_many(
+        {f'{PAGE_TAG_PREFIX}:{tag}': uuid4().hex for tag in tags}, None
+    )
+
+
+def invalidate_all_pages():
+    invalidate_pages([ALL_PAGES])
+
+
+def page_cache_enabled():
+    return bool(getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 300))
+
+
+def page_cache_timeout(feed=None):
+    """Время жизни страницы, не дольше выхода публикации в её ленте."""
+    return limit_timeout(
+        getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 300), feed
+    )
@@ -0,0 +1,49 @@
+"""Единое «сейчас» для всех запросов к базе в рамках HTTP-запроса.
+
+blog.middleware.RequestClockMiddleware фиксирует момент начала запроса,
+округлённый вниз до BLOG_CLOCK_GRANULARITY секунд. Все фильтры по дате
+публикации берут его через now(), поэтому одинаковые запросы лент
+в пределах одного интервала совпадают и хорошо кэшируются.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone as dt_timezone
+from math import ceil, floor
+
+from django.conf import settings
+from django.utils import timezone
+
+_request_now = ContextVar('blog_request_now', default=None)
+
+
+def granularity():
+    return max(1, getattr(settings, 'BLOG_CLOCK_GRANULARITY', 1))
+
+
+def truncate(moment):
+    step = granularity()
+    return datetime.fromtimestamp(
+        floor(moment.timestamp() / step) * step, tz=dt_timezone.utc
+    )
+
+
+def visible_at(pub_date):
+    """Момент, с которого публикация попадает в ленты."""
+    step = granularity()
+    return datetime.fromtimestamp(
+        ceil(pub_date.timestamp() / step) * step, tz=dt_timezone.utc
+    )
+
+
+def now():
+    moment = _request_now.get()
+    return moment if moment is not None else timezone.now()
+
+
+@contextmanager
+def frozen(moment):
+    token = _request_now.set(moment)
+    try:
+        yield moment
+    finally:
+        _request_now.reset(token)
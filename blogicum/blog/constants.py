@@ -13,3 +13,6 @@ CATEGORY_SLUG_MAX_LENGTH = 64
 POST_TITLE_MAX_LENGTH_TITLE = 256
 POST_TEXT_MAX_LENGTH_TITLE = None
 POST_PER_PAGE_MAIN = 5
+
+# Константы для Comment
+COMMENTS_PER_PAGE = 20
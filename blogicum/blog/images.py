@@ -0,0 +1,182 @@
+"""Уменьшенные копии изображений публикаций.
+
+Для каждой ширины из BLOG_THUMBNAIL_WIDTHS сохраняются WebP и JPEG
+варианты. Имена вариантов выводятся из имени оригинала, поэтому
+публикации с одним и тем же изображением делят и его копии.
+Имена и размеры хранятся в Post.image_variants:
+
+    {'image': 'posts_images/…', 'width': 1200, 'height': 800, 'sizes': [
+        {'width': 320, 'height': 213, 'webp': '...', 'jpeg': '...'},
+        ...
+    ]}
+"""
+import hashlib
+import logging
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .storage import shard
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = 'posts_images/thumbs'
+# Ключ в описании варианта: (формат Pillow, расширение файла, опции).
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {
+        'quality': 82, 'optimize': True, 'progressive': True
+    }),
+}
+# Ширина варианта, который браузер без srcset получит в src.
+DEFAULT_WIDTH = 640
+
+
+def thumbnail_widths():
+    return sorted(getattr(settings, 'BLOG_THUMBNAIL_WIDTHS', (320, 640, 960)))
+
+
+def _open_rgb(image_file):
+    image_file.open('rb')
+    try:
+        with Image.open(image_file) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                return background
+            return image.convert('RGB')
+    finally:
+        image_file.close()
+
+
+def variant_name(image_name, width, extension):
+    stem = PurePosixPath(image_name).stem
+    digest = hashlib.sha256(image_name.encode()).hexdigest()
+    return f'{THUMBNAIL_DIR}/{shard(digest)}/{stem}_{width}.{extension}'
+
+
+def make_variants(image_file):
+    """Сохраняет варианты изображения в default_storage.
+
+    Уже существующие варианты того же оригинала не пересчитываются.
+    Возвращает описание вариантов для Post.image_variants или пустой
+    словарь, если файл не удалось прочитать как изображение.
+    """
+    try:
+        original = _open_rgb(image_file)
+    except (OSError, UnidentifiedImageError):
+        logger.warning('Не удалось прочитать %s', image_file.name)
+        return {}
+    # Больше оригинала не увеличиваем: хватит одного варианта
+    # в его собственную ширину.
+    widths = [
+        width for width in thumbnail_widths() if width < original.width
+    ] or [original.width]
+    sizes = []
+    for width in widths:
+        height = max(1, round(original.height * width / original.width))
+        size = {'width': width, 'height': height}
+        resized = None
+        for key, (image_format, extension, options) in FORMATS.items():
+            name = variant_name(image_file.name, width, extension)
+            if not default_storage.exists(name):
+                if resized is None:
+                    resized = original.resize((width, height), Image.LANCZOS)
+                buffer = BytesIO()
+                resized.save(buffer, image_format, **options)
+                name = default_storage.save(
+                    name, ContentFile(buffer.getvalue())
+                )
+            size[key] = name
+        sizes.append(size)
+    return {
+        'image': image_file.name,
+        'width': original.width,
+        'height': original.height,
+        'sizes': sizes,
+    }
+
+
+def variant_names(variants):
+    return [
+        size[key]
+        for size in variants.get('sizes', ())
+        for key in FORMATS
+        if size.get(key)
+    ]
+
+
+def strip_metadata(image_file, name):
+    """Пересохраняет оригинал под именем name без EXIF.
+
+    EXIF может содержать координаты съёмки; поворот из него
+    применяется к пикселям. Возвращает имя нового файла или None,
+    если метаданных нет и файл не менялся.
+    """
+    image_file.open('rb')
+    try:
+        with Image.open(image_file) as image:
+            if not image.getexif():
+                return None
+            image_format = image.format
+            options = {'icc_profile': image.info.get('icc_profile')}
+            if image_format == 'JPEG':
+                options['quality'] = 90
+            buffer = BytesIO()
+            ImageOps.exif_transpose(image).save(
+                buffer, image_format, **options
+            )
+    except (OSError, UnidentifiedImageError):
+        logger.warning('Не удалось прочитать %s', image_file.name)
+        return None
+    finally:
+        image_file.close()
+    return image_file.storage.save(name, ContentFile(buffer.getvalue()))
+
+
+class Thumbnails:
+    """Атрибуты src/srcset/размеры для вывода вариантов в шаблоне."""
+
+    def __init__(self, variants):
+        self.storage = default_storage
+        self.sizes = (variants or {}).get('sizes', [])
+
+    def __bool__(self):
+        return bool(self.sizes)
+
+    def _srcset(self, key):
+        return ', '.join(
+            f'{self.storage.url(size[key])} {size["width"]}w'
+            for size in self.sizes
+        )
+
+    @property
+    def webp_srcset(self):
+        return self._srcset('webp')
+
+    @property
+    def jpeg_srcset(self):
+        return self._srcset('jpeg')
+
+    @property
+    def default(self):
+        fitting = [s for s in self.sizes if s['width'] <= DEFAULT_WIDTH]
+        return fitting[-1] if fitting else self.sizes[0]
+
+    @property
+    def src(self):
+        return self.storage.url(self.default['jpeg'])
+
+    @property
+    def width(self):
+        return self.default['width']
+
+    @property
+    def height(self):
+        return self.default['height']
@@ -0,0 +1,124 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.sqlite import configure_connection
+
+SCHEMA = (
+    'CREATE TABLE post (id INTEGER PRIMARY KEY, comment_count INTEGER);'
+    'CREATE TABLE comment (id INTEGER PRIMARY KEY, post_id INTEGER,'
+    ' text TEXT);'
+    'CREATE INDEX comment_post ON comment (post_id, id);'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность читателей и писателей SQLite '
+        'без прагм и с прагмами BLOG_SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0,
+                            help='Длительность каждого прогона, с.')
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--posts', type=int, default=100)
+
+    def handle(self, *args, **options):
+        scenarios = (
+            ('по умолчанию', {}),
+            ('BLOG_SQLITE_PRAGMAS', settings.BLOG_SQLITE_PRAGMAS),
+        )
+        for title, pragmas in scenarios:
+            with tempfile.TemporaryDirectory() as directory:
+                stats = self.run_scenario(
+                    Path(directory) / 'bench.sqlite3', pragmas, options
+                )
+            duration = options['duration']
+            self.stdout.write(
+                f'{title}: чтений {stats["reads"] / duration:.0f}/с, '
+                f'записей {stats["writes"] / duration:.0f}/с, '
+                f'ошибок блокировки {stats["locked"]}'
+            )
+
+    def run_scenario(self, path, pragmas, options):
+        connection = self.connect(path, pragmas)
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            'INSERT INTO post (id, comment_count) VALUES (?, 0)',
+            [(pk,) for pk in range(1, options['posts'] + 1)],
+        )
+        connection.close()
+        stats = {'reads': 0, 'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def worker(operation):
+            counted = {'reads': 0, 'writes': 0, 'locked': 0}
+            connection = self.connect(path, pragmas)
+            rng = random.Random()
+            while time.monotonic() < deadline:
+                post_id = rng.randint(1, options['posts'])
+                try:
+                    counted[operation(connection, post_id)] += 1
+                except sqlite3.OperationalError as error:
+                    if 'locked' not in str(error):
+                        raise
+                    if connection.in_transaction:
+                        connection.rollback()
+                    counted['locked'] += 1
+            connection.close()
+            with lock:
+                for key, value in counted.items():
+                    stats[key] += value
+
+        threads = [
+            threading.Thread(target=worker, args=(self.read,))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=(self.write,))
+            for _ in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
+
+    @staticmethod
+    def connect(path, pragmas):
+        # Без прагм соединение ведёт себя как у Django по умолчанию.
+        connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        configure_connection(connection, pragmas)
+        return connection
+
+    @staticmethod
+    def read(connection, post_id):
+        connection.execute(
+            'SELECT id, text FROM comment WHERE post_id = ? '
+            'ORDER BY id DESC LIMIT 20', (post_id,)
+        ).fetchall()
+        return 'reads'
+
+    @staticmethod
+    def write(connection, post_id):
+        connection.execute('BEGIN')
+        connection.execute(
+            'INSERT INTO comment (post_id, text) VALUES (?, ?)',
+            (post_id, 'Комментарий'),
+        )
+        connection.execute(
+            'UPDATE post SET comment_count = comment_count + 1 '
+            'WHERE id = ?', (post_id,)
+        )
+        connection.execute('COMMIT')
+        return 'writes'
@@ -0,0 +1,95 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.bulkload import BulkLoader, iter_objects, open_fixture
+from blog.models import Comment, Post
+from blog.signals import invalidate_everything
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает большие фикстуры dumpdata (JSON, JSONL, .gz) потоком '
+        'и пачками многострочных INSERT. Сигналы моделей не вызываются: после '
+        'загрузки пересчитываются число комментариев и поисковый индекс.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+', metavar='fixture')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '-i', '--ignorenonexistent', action='store_true',
+            help='Пропускать поля, которых нет в моделях.'
+        )
+        parser.add_argument(
+            '--skip-rebuild', action='store_true',
+            help='Не пересчитывать производные данные после загрузки.'
+        )
+
+    def handle(self, *args, fixtures, batch_size, database,
+               ignorenonexistent, skip_rebuild, verbosity, **options):
+        self.verbosity = verbosity
+        self.started = time.perf_counter()
+        self.loaded = 0
+        loader = BulkLoader(
+            using=database,
+            batch_size=batch_size,
+            ignorenonexistent=ignorenonexistent,
+            on_flush=self.report_progress,
+        )
+        connection = connections[database]
+        with transaction.atomic(using=database):
+            with connection.constraint_checks_disabled():
+                for path in fixtures:
+                    with open_fixture(path) as stream:
+                        loader.load(iter_objects(stream))
+                loader.finish()
+            # Внешние ключи проверяются один раз, по загруженным таблицам.
+            connection.check_constraints(table_names=[
+                model._meta.db_table for model in loader.counts
+            ])
+            self.reset_sequences(connection, list(loader.counts))
+        elapsed = time.perf_counter() - self.started
+
+        for model, count in sorted(
+            loader.counts.items(), key=lambda item: item[0]._meta.label
+        ):
+            self.stdout.write(f'{model._meta.label}: {count}')
+        total = sum(loader.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с)'
+        ))
+        if not skip_rebuild:
+            self.rebuild(loader.counts, database)
+
+    def report_progress(self, model, count):
+        self.loaded += count
+        if self.verbosity >= 2:
+            elapsed = time.perf_counter() - self.started
+            self.stdout.write(
+                f'{model._meta.label}: +{count}, всего {self.loaded} '
+                f'({self.loaded / max(elapsed, 1e-9):.0f} строк/с)'
+            )
+
+    @staticmethod
+    def reset_sequences(connection, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def rebuild(self, counts, database):
+        # Пакетная вставка обходит сигналы, которые поддерживают эти данные.
+        if Post in counts or Comment in counts:
+            call_command('rebuild_comment_counts', database=database,
+                         stdout=self.stdout)
+        if Post in counts:
+            call_command('rebuild_search_index', database=database,
+                         stdout=self.stdout)
+        invalidate_everything()
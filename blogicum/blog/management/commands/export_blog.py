@@ -0,0 +1,114 @@
+import csv
+import gzip
+import json
+import time
+from pathlib import Path
+
+from django.core import serializers
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import JSONField
+
+from blog.models import Category, Comment, Location, Post
+
+# В порядке зависимостей: выгрузку можно загрузить обратно
+# командой bulk_loaddata.
+MODELS = {
+    'category': Category,
+    'location': Location,
+    'post': Post,
+    'comment': Comment,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает категории, местоположения, публикации и комментарии '
+        'в JSON Lines (формат dumpdata) или CSV, по файлу на модель. '
+        'Строки читаются курсором частями по --chunk-size, поэтому '
+        'память не зависит от размера таблиц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Каталог для файлов выгрузки.')
+        parser.add_argument(
+            '--models', nargs='+', choices=MODELS, default=list(MODELS),
+            help='Модели для выгрузки; по умолчанию все.'
+        )
+        parser.add_argument('--format', choices=('jsonl', 'csv'),
+                            default='jsonl')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--gzip', action='store_true', dest='compress',
+                            help='Сжимать файлы выгрузки.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, output, models, format, chunk_size, compress,
+               database, **options):
+        output = Path(output)
+        output.mkdir(parents=True, exist_ok=True)
+        export = self.export_jsonl if format == 'jsonl' else self.export_csv
+        for name in models:
+            model = MODELS[name]
+            path = output / f'{model._meta.label_lower}.{format}'
+            if compress:
+                path = path.with_name(path.name + '.gz')
+            queryset = model._base_manager.using(database).order_by('pk')
+            started = time.perf_counter()
+            with self.open(path, compress) as stream:
+                count = export(queryset, stream, chunk_size)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{model._meta.label}: {count} строк в {path} '
+                f'за {elapsed:.1f} с'
+            )
+
+    @staticmethod
+    def open(path, compress):
+        if compress:
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    @staticmethod
+    def export_jsonl(queryset, stream, chunk_size):
+        counter = _Counter(queryset.iterator(chunk_size=chunk_size))
+        serializers.serialize('jsonl', counter, stream=stream)
+        return counter.count
+
+    @staticmethod
+    def export_csv(queryset, stream, chunk_size):
+        fields = queryset.model._meta.concrete_fields
+        columns = [field.attname for field in fields]
+        # Поля JSON пишутся в JSON, а не в repr() словарей Python.
+        json_columns = [
+            (index, field.encoder)
+            for index, field in enumerate(fields)
+            if isinstance(field, JSONField)
+        ]
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        count = 0
+        for row in queryset.values_list(*columns).iterator(
+            chunk_size=chunk_size
+        ):
+            if json_columns:
+                row = list(row)
+                for index, encoder in json_columns:
+                    row[index] = json.dumps(
+                        row[index], cls=encoder, ensure_ascii=False
+                    )
+            writer.writerow(row)
+            count += 1
+        return count
+
+
+class _Counter:
+    """Пропускает объекты сериализатору, считая их по пути."""
+
+    def __init__(self, iterable):
+        self.iterable = iterable
+        self.count = 0
+
+    def __iter__(self):
+        for obj in self.iterable:
+            self.count += 1
+            yield obj
@@ -0,0 +1,264 @@
+import random
+import time
+from datetime import timedelta
+from io import BytesIO
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+from PIL import Image, ImageDraw
+
+from blog.bulkload import insert_raw
+from blog.images import make_variants, variant_names
+from blog.models import Category, Comment, Location, Post, User
+from blog.signals import invalidate_everything
+from blog.tasks import collect_image_files
+
+# Сколько разных текстов заготовить: Faker медленный, а для замеров
+# хватает повторяющихся текстов реалистичной длины.
+TEXT_POOL_SIZE = 200
+IMAGE_SIZE = (1200, 800)
+
+
+def zipf_weights(count, skew):
+    """Накопленные веса для random.choices: k-й элемент весит 1/k^skew."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def next_pk(model):
+    return (model._base_manager.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими данными для замеров: '
+        'пользователи, категории с неравномерной популярностью, '
+        'публикации в прошлом и будущем, комментарии по закону Ципфа '
+        'и изображения. Строки вставляются пачками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=50_000)
+        parser.add_argument('--images', type=int, default=10,
+                            help='Число разных изображений.')
+        parser.add_argument('--image-share', type=float, default=0.3,
+                            help='Доля публикаций с изображением.')
+        parser.add_argument('--future-share', type=float, default=0.05,
+                            help='Доля отложенных публикаций.')
+        parser.add_argument('--hidden-share', type=float, default=0.05,
+                            help='Доля снятых с публикации.')
+        parser.add_argument('--category-skew', type=float, default=1.0)
+        parser.add_argument('--comment-skew', type=float, default=1.1)
+        parser.add_argument('--days', type=int, default=365,
+                            help='Глубина ленты в прошлое, дней.')
+        parser.add_argument('--password',
+                            help='Общий пароль пользователей для входа '
+                                 'при нагрузочном тесте.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 and (options['posts'] or options['comments']):
+            raise CommandError('Публикациям и комментариям нужны авторы.')
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        self.now = timezone.now()
+        self.images = []
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                users = self.create_users()
+                categories = self.create_categories()
+                locations = self.create_locations()
+                posts = self.create_posts(users, categories, locations)
+                comments = self.create_comments(users, posts)
+                self.reset_sequences()
+        except BaseException:
+            # Откат не удаляет записанные файлы: изображения, на которые
+            # никто не ссылается, убирает сборщик.
+            for name, variants in self.images:
+                collect_image_files(image=name, names=variant_names(variants))
+            raise
+        elapsed = time.perf_counter() - started
+        total = sum(map(len, (users, categories, locations, posts, comments)))
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано строк: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с)'
+        ))
+        # Вставка в обход save() не вызывает сигналы.
+        call_command('rebuild_comment_counts', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        invalidate_everything()
+
+    def insert(self, model, rows):
+        """Вставляет объекты из генератора пачками, возвращает их ключи."""
+        ids = []
+        rows = iter(rows)
+        while batch := list(islice(rows, self.options['batch_size'])):
+            insert_raw(model, batch)
+            ids.extend(obj.pk for obj in batch)
+        self.stdout.write(f'{model._meta.label}: {len(ids)}')
+        return ids
+
+    def texts(self, make):
+        return [make() for _ in range(TEXT_POOL_SIZE)]
+
+    def past(self, days):
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def create_users(self):
+        start = next_pk(User)
+        password = (
+            make_password(self.options['password'])
+            if self.options['password'] else make_password(None)
+        )
+        return self.insert(User, (
+            User(
+                pk=pk,
+                username=f'load_user_{pk}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                email=f'load_user_{pk}@example.com',
+                password=password,
+                date_joined=self.past(self.options['days']),
+            )
+            for pk in range(start, start + self.options['users'])
+        ))
+
+    def create_categories(self):
+        start = next_pk(Category)
+        descriptions = self.texts(self.faker.paragraph)
+        return self.insert(Category, (
+            Category(
+                pk=pk,
+                title=self.faker.word().capitalize(),
+                description=self.rng.choice(descriptions),
+                slug=f'load-{pk}',
+                is_published=True,
+                created_at=self.past(self.options['days']),
+            )
+            for pk in range(start, start + self.options['categories'])
+        ))
+
+    def create_locations(self):
+        start = next_pk(Location)
+        return self.insert(Location, (
+            Location(
+                pk=pk,
+                # Название уникально, а городов у Faker меньше, чем мест.
+                name=f'{self.faker.city()} {pk}',
+                is_published=True,
+                created_at=self.past(self.options['days']),
+            )
+            for pk in range(start, start + self.options['locations'])
+        ))
+
+    def create_images(self):
+        """Заготавливает изображения и их уменьшенные копии один раз."""
+        field = Post._meta.get_field('image')
+        images = self.images
+        for _ in range(self.options['images']):
+            image = Image.new('RGB', IMAGE_SIZE, self.faker.color())
+            draw = ImageDraw.Draw(image)
+            for _ in range(8):
+                x, y = (self.rng.randrange(size) for size in IMAGE_SIZE)
+                draw.ellipse(
+                    (x, y, x + 300, y + 200), fill=self.faker.color()
+                )
+            buffer = BytesIO()
+            image.save(buffer, 'JPEG', quality=85)
+            name = field.storage.save(
+                field.generate_filename(None, 'load.jpg'),
+                ContentFile(buffer.getvalue()),
+            )
+            images.append((name, make_variants(Post(image=name).image)))
+        return images
+
+    def post_state(self):
+        """Дата и признак публикации: прошлое, будущее или скрытая."""
+        roll = self.rng.random()
+        if roll < self.options['future_share']:
+            pub_date = self.now + timedelta(
+                seconds=self.rng.uniform(60, 30 * 86400)
+            )
+            return pub_date, True
+        hidden = roll > 1 - self.options['hidden_share']
+        return self.past(self.options['days']), not hidden
+
+    def create_posts(self, users, categories, locations):
+        images = self.create_images() if self.options['image_share'] else []
+        titles = self.texts(lambda: self.faker.sentence()[:-1])
+        texts = self.texts(lambda: '\n\n'.join(self.faker.paragraphs(3)))
+        category_weights = zipf_weights(
+            len(categories), self.options['category_skew']
+        )
+        start = next_pk(Post)
+
+        def post(pk):
+            pub_date, is_published = self.post_state()
+            image, variants = '', {}
+            if images and self.rng.random() < self.options['image_share']:
+                image, variants = self.rng.choice(images)
+            return Post(
+                pk=pk,
+                title=self.rng.choice(titles),
+                text=self.rng.choice(texts),
+                pub_date=pub_date,
+                is_published=is_published,
+                created_at=min(pub_date, self.now),
+                author_id=self.rng.choice(users),
+                category_id=self.rng.choices(
+                    categories, cum_weights=category_weights
+                )[0] if categories else None,
+                location_id=(
+                    self.rng.choice(locations)
+                    if locations and self.rng.random() < 0.7 else None
+                ),
+                image=image,
+                image_variants=variants,
+            )
+
+        return self.insert(Post, (
+            post(pk) for pk in range(start, start + self.options['posts'])
+        ))
+
+    def create_comments(self, users, posts):
+        if not posts:
+            return []
+        # Популярность не связана с порядком публикаций.
+        popular = self.rng.sample(posts, len(posts))
+        weights = zipf_weights(len(popular), self.options['comment_skew'])
+        texts = self.texts(self.faker.sentence)
+        start = next_pk(Comment)
+        return self.insert(Comment, (
+            Comment(
+                pk=pk,
+                post_id=self.rng.choices(popular, cum_weights=weights)[0],
+                author_id=self.rng.choice(users),
+                text=self.rng.choice(texts),
+                created_at=self.past(self.options['days']),
+            )
+            for pk in range(start, start + self.options['comments'])
+        ))
+
+    @staticmethod
+    def reset_sequences():
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [User, Category, Location, Post, Comment]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
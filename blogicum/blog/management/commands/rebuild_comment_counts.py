@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.models import Comment, Post
+from blog.utils import actual_comment_count
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает число комментариев, сохранённое у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, database, **options):
+        updated = Post.objects.using(database).exclude(
+            comment_count=actual_comment_count(Comment)
+        ).update(comment_count=actual_comment_count(Comment))
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено публикаций: {updated}')
+        )
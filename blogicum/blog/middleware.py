@@ -0,0 +1,139 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from . import clock
+from .routers import request_reads
+
+metrics_logger = logging.getLogger('blog.metrics')
+
+
+class RequestClockMiddleware:
+    """Фиксирует округлённое «сейчас» на время обработки запроса."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with clock.frozen(clock.truncate(timezone.now())):
+            return self.get_response(request)
+
+
+class ReadReplicaMiddleware:
+    """Направляет чтения помеченных представлений на реплику.
+
+    После успешного изменяющего запроса ставит cookie, на время жизни
+    которой посетитель читает только из основной базы.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = settings.BLOG_REPLICA_STICKY_COOKIE
+        allowed = (request.method in self.safe_methods
+                   and cookie not in request.COOKIES)
+        with request_reads(allowed) as reads:
+            request._replica_reads = reads
+            response = self.get_response(request)
+        if (request.method not in self.safe_methods
+                and response.status_code < 400):
+            response.set_cookie(
+                cookie, '1',
+                max_age=settings.BLOG_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        if getattr(view, 'use_read_replica', False):
+            request._replica_reads.active = True
+
+
+class RequestMetrics:
+    """Счётчики одного запроса: SQL-запросы, время БД и шаблонов."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обёртка connection.execute_wrapper().
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        self.render_time += time.perf_counter() - self._render_started
+
+    def as_dict(self, request, response):
+        match = request.resolver_match
+        return {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'total_ms': round(
+                (time.perf_counter() - self.started) * 1000, 2
+            ),
+        }
+
+
+class RequestMetricsMiddleware:
+    """Замеряет запросы к БД и рендеринг шаблонов по каждому запросу.
+
+    Включается настройкой BLOG_REQUEST_METRICS. Метрики пишутся в лог
+    `blog.metrics` (поля доступны в `record.metrics`) и в заголовок
+    Server-Timing. Время запросов, выполненных при рендеринге
+    шаблона, входит и в db, и в render.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'BLOG_REQUEST_METRICS', False):
+            return self.get_response(request)
+        metrics = request._metrics = RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        data = metrics.as_dict(request, response)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={data["db_ms"]};desc="{data["queries"]} queries"',
+            f'render;dur={data["render_ms"]}',
+            f'total;dur={data["total_ms"]}',
+        ))
+        metrics_logger.info(
+            ' '.join(f'{key}={value}' for key, value in data.items()),
+            extra={'metrics': data},
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, '_metrics', None)
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.finish_render)
+        return response
@@ -1,11 +1,164 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage
+from django.http import Http404
 from django.urls import reverse
 from .models import Comment, Post, User
-from django.db.models import Count
-from django.shortcuts import get_object_or_404
+from .constants import COMMENTS_PER_PAGE
+from .caching import (
+    author_feed,
+    page_cache_enabled,
+    page_cache_key,
+    page_cache_timeout,
+)
+from .pagination import CachedCountPaginator, CursorPaginator
+from .utils import filter_published_posts, select_post_relations
+from django.shortcuts import get_object_or_404, redirect
+from django.utils.functional import cached_property
 
 POSTS_PER_PAGE = 10
 
 
+class AnonymousPageCacheMixin:
+    """Отдаёт анонимным посетителям готовую страницу из кэша.
+
+    Ключ строится по полному пути запроса (вместе с номером страницы)
+    и версиям тегов из get_page_cache_tags(), которые сбрасываются
+    сигналами при изменении публикаций, комментариев, категорий и мест.
+    """
+
+    def get_page_cache_tags(self):
+        return []
+
+    def get_page_cache_timeout(self):
+        get_feed = getattr(self, 'get_feed', None)
+        return page_cache_timeout(get_feed() if get_feed else None)
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+                or not page_cache_enabled()):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(
+            request.get_full_path(), self.get_page_cache_tags()
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if (response.status_code == HTTPStatus.OK
+                and hasattr(response, 'add_post_render_callback')):
+            timeout = self.get_page_cache_timeout()
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, rendered, timeout)
+            )
+        return response
+
+
+class CursorPaginationMixin:
+    """Keyset-пагинация ленты по параметру ?cursor=.
+
+    Без курсора в запросе используется обычная постраничная навигация,
+    если только настройка BLOG_FEED_PAGINATION не равна 'cursor'.
+    """
+
+    cursor_ordering = ('-pub_date', '-id')
+    cursor_query_param = 'cursor'
+
+    def use_cursor_pagination(self):
+        return (
+            self.cursor_query_param in self.request.GET
+            or getattr(settings, 'BLOG_FEED_PAGINATION', 'offset') == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(
+                self.request.GET.get(self.cursor_query_param)
+            )
+        except InvalidPage as error:
+            raise Http404(str(error))
+        page.set_link_queries(self.request.GET, self.cursor_query_param)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class FeedMixin(CursorPaginationMixin):
+    """Лента публикаций с закэшированным числом страниц."""
+
+    paginate_by = POSTS_PER_PAGE
+    paginator_class = CachedCountPaginator
+
+    def get_feed(self):
+        return None
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            feed=self.get_feed(), **kwargs
+        )
+
+
+class CommentPaginationMixin:
+    """Keyset-пагинация комментариев к публикации по ?comments=."""
+
+    comments_per_page = COMMENTS_PER_PAGE
+    comments_query_param = 'comments'
+
+    def get_comment_page(self, post):
+        paginator = CursorPaginator(
+            post.comments.select_related('author'),
+            self.comments_per_page,
+            ordering=('created_at', 'id')
+        )
+        try:
+            page = paginator.page(
+                self.request.GET.get(self.comments_query_param)
+            )
+        except InvalidPage as error:
+            raise Http404(str(error))
+        page.set_link_queries(self.request.GET, self.comments_query_param)
+        return page
+
+
+class OwnerObjectMixin:
+    """Загружает редактируемый объект один раз и только у его автора.
+
+    Фильтр по автору выполняется в том же запросе; отличить чужой объект
+    от несуществующего помогает отдельная проверка, нужная лишь
+    на этом редком пути.
+    """
+
+    def get_owned_object(self):
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = self.get_queryset().filter(
+                pk=self.kwargs[self.pk_url_kwarg],
+                author_id=self.request.user.pk
+            ).first()
+        return self._owned_object
+
+    def get_object(self, queryset=None):
+        return self.get_owned_object()
+
+    def handle_not_owner(self):
+        raise PermissionDenied
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.get_owned_object() is None:
+            if not self.get_queryset().filter(
+                    pk=self.kwargs[self.pk_url_kwarg]).exists():
+                raise Http404
+            return self.handle_not_owner()
+        return super().dispatch(request, *args, **kwargs)
+
+
 class PostsEditMixin:
     model = Post
     template_name = 'blog/create.html'
@@ -19,19 +172,36 @@ class CommentEditMixin:
     def get_success_url(self):
         return reverse('blog:post_detail', args=[self.kwargs['post_id']])
 
+    def handle_not_owner(self):
+        return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
-class ProfileMixin:
 
-    paginate_by = POSTS_PER_PAGE
+class ProfileMixin(FeedMixin):
+
     context_object_name = 'posts'
     template_name = 'blog/profile.html'
 
-    def get_profile_user(self):
-
+    @cached_property
+    def profile_user(self):
         return get_object_or_404(User, username=self.kwargs['username'])
 
-    def get_posts_queryset(self, user):
-        return user.posts.select_related(
-            'category',
-            'location'
-        ).annotate(comment_count=Count('comment')).order_by('-pub_date')
+    @property
+    def is_owner(self):
+        return self.request.user == self.profile_user
+
+    def get_queryset(self):
+        posts = self.profile_user.posts.all()
+        if self.is_owner:
+            return select_post_relations(posts.order_by('-pub_date'))
+        return filter_published_posts(posts)
+
+    def get_feed(self):
+        return author_feed(self.profile_user.pk, with_hidden=self.is_owner)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'profile': self.profile_user,
+            'is_owner': self.is_owner
+        })
+        return context
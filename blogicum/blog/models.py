@@ -1,9 +1,12 @@
 from django.db import models
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import Truncator
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from . import clock
+from .images import Thumbnails
+from .storage import HashedStorage
 from .constants import (
     POST_TITLE_MAX_LENGTH_TITLE,
     CATEGORY_SLUG_MAX_LENGTH,
@@ -17,7 +20,7 @@ User = get_user_model()
 class PublishedManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
+            pub_date__lte=clock.now(),
             is_published=True,
             category__is_published=True
         ).select_related('category', 'location', 'author')
@@ -108,8 +111,20 @@ class Post(BaseModel):
     image = models.ImageField(
         _('Изображение'),
         upload_to='posts_images/',
+        storage=HashedStorage(),
         blank=True
     )
+    image_variants = models.JSONField(
+        _('Варианты изображения'),
+        default=dict,
+        blank=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        _('Число комментариев'),
+        default=0,
+        editable=False
+    )
 
     objects = models.Manager()
     published = PublishedManager()
@@ -118,6 +133,28 @@ class Post(BaseModel):
         verbose_name = _('публикация')
         verbose_name_plural = _('Публикации')
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx'
+            ),
+            # Подсчёт ссылок на файл перед его удалением.
+            models.Index(
+                fields=('image',),
+                condition=~models.Q(image=''),
+                name='post_image_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -125,6 +162,10 @@ class Post(BaseModel):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.pk})
 
+    @cached_property
+    def thumbnails(self):
+        return Thumbnails(self.image_variants)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -145,6 +186,12 @@ class Comment(models.Model):
         verbose_name = _('комментарий')
         verbose_name_plural = _('Комментарии')
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_thread_idx'
+            ),
+        )
 
     def __str__(self):
         return f'Комментарий {self.author} к посту {self.post}'
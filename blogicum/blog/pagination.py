@@ -0,0 +1,192 @@
+import base64
+import json
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .caching import feed_count_key, feed_count_timeout
+
+CURSOR_FORWARD = 'n'
+CURSOR_BACKWARD = 'p'
+
+
+class WindowedPage(Page):
+
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(
+            self.number, on_each_side=2, on_ends=1
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator с закэшированным (приблизительным) числом записей.
+
+    COUNT(*) по ленте выполняется не чаще одного раза за время жизни
+    ключа; сбрасывают ключ сигналы сохранения и удаления публикаций.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, feed=None):
+        super().__init__(object_list, per_page, orphans,
+                         allow_empty_first_page)
+        self.feed = feed
+
+    @cached_property
+    def count(self):
+        if self.feed is None:
+            return self.object_list.count()
+        key = feed_count_key(self.feed)
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, feed_count_timeout(self.feed))
+        return count
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class CursorPage:
+    """Страница keyset-пагинации с курсорами на соседние страницы."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def set_link_queries(self, params, name):
+        """Готовит строки запроса ссылок, сохраняя прочие параметры."""
+        def query(cursor):
+            link = params.copy()
+            link[name] = cursor
+            return link.urlencode()
+
+        self.first_query = query('')
+        self.next_query = query(self.next_cursor) if self.has_next() else ''
+        self.previous_query = (
+            query(self.previous_cursor) if self.has_previous() else ''
+        )
+
+
+class CursorPaginator:
+    """Keyset-пагинация по упорядоченному набору полей.
+
+    Вместо LIMIT/OFFSET и COUNT(*) страница выбирается условием
+    «строго после последней записи предыдущей страницы», поэтому
+    глубокие страницы стоят столько же, сколько первая.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def page(self, cursor=None):
+        direction, position = CURSOR_FORWARD, None
+        if cursor:
+            direction, position = self.decode_cursor(cursor)
+        backward = direction == CURSOR_BACKWARD
+
+        ordering = self.ordering
+        if backward:
+            ordering = tuple(self._flip(name) for name in ordering)
+        queryset = self.queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, backward))
+
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if backward:
+            items.reverse()
+        if not items:
+            return CursorPage(items, self)
+
+        has_next = has_more if not backward else True
+        has_previous = has_more if backward else position is not None
+        return CursorPage(
+            items,
+            self,
+            next_cursor=(
+                self.encode_cursor(CURSOR_FORWARD, items[-1])
+                if has_next else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(CURSOR_BACKWARD, items[0])
+                if has_previous else None
+            ),
+        )
+
+    def encode_cursor(self, direction, obj):
+        values = [
+            self._field(name).value_to_string(obj) for name in self.fields
+        ]
+        raw = json.dumps([direction, *values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, *values = json.loads(
+                base64.urlsafe_b64decode(padded.encode())
+            )
+            if (direction not in (CURSOR_FORWARD, CURSOR_BACKWARD)
+                    or len(values) != len(self.fields)):
+                raise ValueError
+            position = [
+                self._field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise InvalidPage('Некорректный курсор страницы.')
+        return direction, position
+
+    def _field(self, name):
+        return self.queryset.model._meta.get_field(name)
+
+    @staticmethod
+    def _flip(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    def _seek(self, position, backward):
+        # (a, b) после (x, y) <=> a > x OR (a = x AND b > y)
+        # для каждого поля с учётом его направления сортировки.
+        condition = Q()
+        for index in reversed(range(len(self.fields))):
+            name = self.fields[index]
+            descending = self.ordering[index].startswith('-') != backward
+            lookup = 'lt' if descending else 'gt'
+            step = Q(**{f'{name}__{lookup}': position[index]})
+            if index < len(self.fields) - 1:
+                step |= Q(**{name: position[index]}) & condition
+            condition = step
+        return condition
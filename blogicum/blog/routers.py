@@ -0,0 +1,63 @@
+"""Чтение с реплики БД для помеченных представлений.
+
+Представление с атрибутом `use_read_replica = True` читает данные
+из базы BLOG_READ_REPLICA, если она описана в DATABASES. После
+успешного изменяющего запроса ReadReplicaMiddleware ставит короткоживущую
+cookie, и пока она жива, все чтения посетителя идут в основную базу:
+он сразу видит собственные записи, даже если реплика отстаёт.
+Пользователи и сессии всегда читаются из основной базы: только что
+вошедший посетитель иначе оказался бы анонимом на отстающей реплике.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica_reads = ContextVar('replica_reads', default=None)
+
+# Приложения, чтения которых никогда не уходят на реплику.
+PRIMARY_ONLY_APPS = ('auth', 'sessions')
+
+
+class ReplicaReads:
+    """Решение по текущему запросу: можно ли читать с реплики."""
+
+    def __init__(self, allowed):
+        self.allowed = allowed
+        self.active = False
+
+
+def replica_alias():
+    alias = getattr(settings, 'BLOG_READ_REPLICA', None)
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def request_reads(allowed):
+    token = _replica_reads.set(ReplicaReads(allowed))
+    try:
+        yield _replica_reads.get()
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReadReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return 'default'
+        reads = _replica_reads.get()
+        if reads is not None and reads.allowed and reads.active:
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия основной базы, связи между ними допустимы.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схему реплики переносит репликация, а не migrate.
+        return db != replica_alias()
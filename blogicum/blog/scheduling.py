@@ -0,0 +1,98 @@
+"""Индекс ближайших отложенных публикаций по лентам.
+
+Для каждой ленты (см. идентификаторы в caching.py) хранится момент,
+когда в ней появится следующая запланированная публикация. Слои кэша
+ограничивают им время жизни своих записей вместо коротких TTL на всё.
+"""
+from datetime import datetime, timezone as dt_timezone
+from math import ceil
+
+from django.core.cache import cache
+
+from . import clock
+from .models import Post
+
+SCHEDULE_PREFIX = 'blog:next-publication'
+SCHEDULE_GENERATION_KEY = 'blog:next-publication-generation'
+NOTHING_SCHEDULED = 0
+NOTHING_SCHEDULED_TIMEOUT = 24 * 60 * 60
+
+
+def _generation():
+    return cache.get_or_set(SCHEDULE_GENERATION_KEY, 1, None)
+
+
+def _schedule_key(feed):
+    return f'{SCHEDULE_PREFIX}:{_generation()}:{feed}'
+
+
+def _upcoming_posts(feed):
+    kind, _, rest = feed.partition(':')
+    posts = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=clock.now()
+    )
+    if kind == 'category':
+        return posts.filter(category_id=rest)
+    if kind == 'author':
+        author_id, _, scope = rest.partition(':')
+        if scope == 'all':
+            # Автор видит свои отложенные публикации сразу.
+            return None
+        return posts.filter(author_id=author_id)
+    return posts
+
+
+def next_publication(feed):
+    """Момент, когда в ленте появится следующая публикация, или None."""
+    key = _schedule_key(feed)
+    stamp = cache.get(key)
+    if stamp is None:
+        posts = _upcoming_posts(feed)
+        upcoming = None
+        if posts is not None:
+            upcoming = posts.order_by('pub_date').values_list(
+                'pub_date', flat=True
+            ).first()
+        if upcoming is None:
+            stamp = NOTHING_SCHEDULED
+            timeout = NOTHING_SCHEDULED_TIMEOUT
+        else:
+            upcoming = clock.visible_at(upcoming)
+            stamp = upcoming.timestamp()
+            timeout = _seconds_until(upcoming)
+        cache.set(key, stamp, timeout)
+    if stamp == NOTHING_SCHEDULED:
+        return None
+    upcoming = datetime.fromtimestamp(stamp, tz=dt_timezone.utc)
+    if upcoming <= clock.now():
+        # Публикация уже вышла: ищем следующую.
+        cache.delete(key)
+        return next_publication(feed)
+    return upcoming
+
+
+def _seconds_until(moment):
+    return max(1, ceil((moment - clock.now()).total_seconds()))
+
+
+def limit_timeout(timeout, feed):
+    """Сокращает timeout до выхода ближайшей публикации в ленте."""
+    if feed is None:
+        return timeout
+    upcoming = next_publication(feed)
+    if upcoming is None:
+        return timeout
+    return min(timeout, _seconds_until(upcoming))
+
+
+def invalidate_schedule(feeds):
+    cache.delete_many([_schedule_key(feed) for feed in feeds])
+
+
+def invalidate_all_schedules():
+    try:
+        cache.incr(SCHEDULE_GENERATION_KEY)
+    except ValueError:
+        cache.set(SCHEDULE_GENERATION_KEY, 2, None)
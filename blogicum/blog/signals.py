@@ -0,0 +1,261 @@
+from django.db import transaction
+from django.db.models import Count, F, QuerySet
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from taskqueue.registry import enqueue
+
+from .caching import (
+    author_page_tag,
+    category_page_tag,
+    feeds_for_post,
+    home_page_tag,
+    invalidate_all_feed_counts,
+    invalidate_all_pages,
+    invalidate_feed_counts,
+    invalidate_pages,
+    page_tags_for_post,
+    post_page_tag,
+)
+from .images import variant_names
+from .scheduling import invalidate_all_schedules, invalidate_schedule
+from .models import Category, Comment, Location, Post, User
+from .tasks import collect_image_files, process_post_image
+
+POST_CACHE_FIELDS = ('category_id', 'author_id', 'category__slug',
+                     'author__username')
+# Связь публикации: (поле, атрибут для тега страницы, функция тега).
+POST_PAGE_RELATIONS = (
+    ('category', 'slug', category_page_tag),
+    ('author', 'username', author_page_tag),
+)
+MISSING = object()
+
+
+def _deleted_with(origin, models):
+    """Удаление вызвано у объекта или queryset одной из моделей."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+def _post_cache_targets(category_id, author_id, category_slug, username,
+                        post_id):
+    return (
+        feeds_for_post(category_id, author_id),
+        page_tags_for_post(post_id, category_slug, username),
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_post(sender, instance, raw=False, **kwargs):
+    # Публикация могла сменить категорию или автора: кэш старых
+    # лент тоже нужно сбросить. Сменённое изображение нужно удалить.
+    instance._previous_cache_targets = ([], [])
+    instance._previous_related = {}
+    instance._previous_image = ''
+    if raw or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list(
+        *POST_CACHE_FIELDS, 'image'
+    ).first()
+    if previous:
+        *previous, instance._previous_image = previous
+        category_id, author_id, slug, username = previous
+        instance._previous_cache_targets = _post_cache_targets(
+            *previous, instance.pk
+        )
+        instance._previous_related = {
+            'category': (category_id, slug),
+            'author': (author_id, username),
+        }
+
+
+def _related_value(instance, name, attr):
+    """Атрибут связанного объекта, если он известен без запроса.
+
+    Подходит загруженный объект связи или значение до сохранения,
+    если связь не менялась. Иначе возвращает MISSING.
+    """
+    field = instance._meta.get_field(name)
+    related_id = getattr(instance, field.attname)
+    if related_id is None:
+        return None
+    if field.is_cached(instance):
+        related = field.get_cached_value(instance)
+        if related is not None and related.pk == related_id:
+            return getattr(related, attr)
+    previous_id, previous_value = getattr(
+        instance, '_previous_related', {}
+    ).get(name, (None, None))
+    if previous_id == related_id:
+        return previous_value
+    return MISSING
+
+
+def _invalidate_related_page_on_commit(instance, name, attr, make_tag):
+    # Редкий путь: связь сменили по id. Запрос откладывается до
+    # фиксации и не удлиняет транзакцию сохранения.
+    field = instance._meta.get_field(name)
+    related_id = getattr(instance, field.attname)
+
+    def invalidate():
+        value = field.related_model._base_manager.filter(
+            pk=related_id
+        ).values_list(attr, flat=True).first()
+        if value is not None:
+            invalidate_pages([make_tag(value)])
+
+    transaction.on_commit(invalidate)
+
+
+def invalidate_everything():
+    invalidate_all_feed_counts()
+    invalidate_all_schedules()
+    invalidate_all_pages()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, raw=False, **kwargs):
+    if raw:
+        # Фикстура: автор и категория могут загрузиться позже.
+        invalidate_everything()
+        return
+    feeds = feeds_for_post(instance.category_id, instance.author_id)
+    tags = [home_page_tag(), post_page_tag(instance.pk)]
+    for name, attr, make_tag in POST_PAGE_RELATIONS:
+        value = _related_value(instance, name, attr)
+        if value is MISSING:
+            _invalidate_related_page_on_commit(instance, name, attr, make_tag)
+        elif value is not None:
+            tags.append(make_tag(value))
+    previous_feeds, previous_tags = getattr(
+        instance, '_previous_cache_targets', ([], [])
+    )
+    invalidate_feed_counts(feeds + previous_feeds)
+    invalidate_schedule(feeds + previous_feeds)
+    invalidate_pages(tags + previous_tags)
+
+
+@receiver(post_save, sender=Comment)
+def count_added_comment(sender, instance, created, raw=False, **kwargs):
+    # Счётчик из фикстуры уже учитывает её комментарии.
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    # Комментарии удаляемой публикации уходят вместе с ней, а при
+    # удалении автора счётчики уменьшает uncount_author_comments.
+    if _deleted_with(origin, (Post, User)):
+        return
+    # Счётчик мог разойтись с таблицей: ниже нуля он не опускается.
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0)
+    )
+
+
+@receiver(pre_delete, sender=User)
+def uncount_author_comments(sender, instance, **kwargs):
+    # Каскад удалит комментарии пользователя: один UPDATE на публикацию,
+    # а не на каждый комментарий. Его собственные публикации удаляются.
+    per_post = Comment.objects.filter(author=instance).exclude(
+        post__author=instance
+    ).order_by().values('post').annotate(total=Count('id'))
+    for row in per_post:
+        Post.objects.filter(pk=row['post']).update(
+            comment_count=Greatest(F('comment_count') - row['total'], 0)
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, origin=None, **kwargs):
+    # Страницы сбросят сигналы удаляемой публикации или пользователя.
+    if _deleted_with(origin, (Post, User)):
+        return
+    if isinstance(origin, QuerySet):
+        # Из queryset страницы публикации сбрасываются один раз.
+        done = origin.__dict__.setdefault('_invalidated_post_ids', set())
+        if instance.post_id in done:
+            return
+        done.add(instance.post_id)
+    # Число комментариев видно и на карточках в лентах.
+    post = Post.objects.filter(pk=instance.post_id).values_list(
+        *POST_CACHE_FIELDS
+    ).first()
+    if post:
+        invalidate_pages(_post_cache_targets(*post, instance.post_id)[1])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_feeds(sender, instance, **kwargs):
+    invalidate_everything()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    invalidate_all_pages()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, instance, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login: на страницах
+    # это не отражается.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_all_pages()
+
+
+@receiver(pre_save, sender=Post)
+def remember_image_upload(sender, instance, raw=False, **kwargs):
+    # Незафиксированный файл — только что загруженное изображение.
+    instance._image_uploaded = (
+        not raw and bool(instance.image) and not instance.image._committed
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stale = instance.image_variants
+    uploaded = getattr(instance, '_image_uploaded', False)
+    collected = None
+    if stale and (uploaded or not instance.image):
+        # До обработки нового изображения выводится оригинал.
+        sender.objects.filter(pk=instance.pk).update(image_variants={})
+        instance.image_variants = {}
+        instance.__dict__.pop('thumbnails', None)
+        collected = stale.get('image')
+        collect_image_files(image=collected, names=variant_names(stale))
+    previous = getattr(instance, '_previous_image', '')
+    if previous and previous not in (instance.image.name, collected):
+        # Оригинал заменили или убрали раньше, чем у него появились копии.
+        collect_image_files(image=previous, names=[])
+    if uploaded:
+        enqueue(
+            process_post_image,
+            post_id=instance.pk,
+            name=instance.image.name,
+        )
+
+
+@receiver(post_delete, sender=Post)
+def delete_image_files_of_post(sender, instance, **kwargs):
+    if instance.image or instance.image_variants:
+        collect_image_files(
+            image=instance.image.name or None,
+            names=variant_names(instance.image_variants),
+        )
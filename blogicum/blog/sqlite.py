@@ -0,0 +1,29 @@
+"""Настройка соединений SQLite через PRAGMA.
+
+Прагмы берутся из настройки BLOG_SQLITE_PRAGMAS и применяются
+к каждому новому соединению обработчиком сигнала connection_created.
+"""
+import re
+
+from django.conf import settings
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+def configure_connection(dbapi_connection, pragmas):
+    """Применяет прагмы к «сырому» соединению sqlite3."""
+    for name, value in pragmas.items():
+        if not (PRAGMA_NAME.match(name) and PRAGMA_VALUE.match(str(value))):
+            raise ValueError(f'Недопустимая прагма SQLite: {name}={value}')
+        dbapi_connection.execute(f'PRAGMA {name}={value}')
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    # Выполняется мимо курсора Django, чтобы прагмы не попадали
+    # в журнал и счётчики запросов.
+    if connection.vendor != 'sqlite':
+        return
+    configure_connection(
+        connection.connection, getattr(settings, 'BLOG_SQLITE_PRAGMAS', {})
+    )
@@ -0,0 +1,52 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+def shard(digest):
+    """Два уровня подкаталогов, чтобы в одном не копились тысячи файлов."""
+    return f'{digest[:2]}/{digest[2:4]}'
+
+
+class HashedStorage(FileSystemStorage):
+    """Хранилище с адресацией по содержимому.
+
+    Имя файла — SHA-256 его содержимого в каталоге upload_to:
+    posts_images/3f/a2/3fa2….jpg. Одинаковые загрузки сохраняются
+    один раз, а содержимое файла под таким именем никогда не меняется.
+    Удалять файл можно, только когда на него не ссылается ни одна
+    запись (см. blog.tasks.delete_image_files).
+
+    Повторная загрузка существующего файла обновляет время его
+    изменения: пока публикация с ним не сохранена, ссылок на файл нет,
+    и сборщик отличает его от брошенного по этой отметке.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        name = posixpath.join(
+            directory, shard(digest), f'{digest}{extension}'
+        )
+        if self._reuse(name):
+            return name
+        return super().save(name, content, max_length)
+
+    def _reuse(self, name):
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
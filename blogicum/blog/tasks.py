@@ -0,0 +1,82 @@
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from taskqueue.registry import enqueue_later, task
+
+from .caching import invalidate_pages, page_tags_for_post
+from .images import make_variants, strip_metadata, variant_names
+from .models import Post
+
+
+@task()
+def process_post_image(post_id, name):
+    """Убирает EXIF из загруженного изображения и готовит его копии."""
+    post = Post.objects.select_related('category', 'author').filter(
+        pk=post_id, image=name
+    ).first()
+    if post is None:
+        # Публикацию удалили или изображение уже заменили.
+        return
+    # Новый файл сохраняется в каталог upload_to, как при загрузке.
+    stripped = strip_metadata(
+        post.image,
+        post.image.field.generate_filename(post, PurePosixPath(name).name),
+    )
+    if stripped:
+        post.image.name = stripped
+    variants = make_variants(post.image)
+    updated = Post.objects.filter(pk=post_id, image=name).update(
+        image=post.image.name, image_variants=variants
+    )
+    if not updated:
+        collect_image_files(
+            image=stripped or post.image.name, names=variant_names(variants)
+        )
+        return
+    if stripped:
+        collect_image_files(image=name, names=[])
+    invalidate_pages(page_tags_for_post(
+        post.pk,
+        post.category.slug if post.category_id else None,
+        post.author.username,
+    ))
+
+
+def collect_image_files(image, names):
+    """Ставит удаление файлов изображения в очередь с отсрочкой.
+
+    Отсрочка BLOG_IMAGE_GC_DELAY даёт повторной загрузке того же
+    содержимого время сохранить ссылающуюся на файл публикацию.
+    """
+    enqueue_later(
+        settings.BLOG_IMAGE_GC_DELAY, delete_image_files,
+        image=image, names=names,
+    )
+
+
+@task()
+def delete_image_files(image, names):
+    """Удаляет оригинал и его копии, если на оригинал никто не ссылается.
+
+    Оригиналы адресуются по содержимому и общие у публикаций
+    с одинаковым изображением, поэтому число ссылок — это число
+    публикаций с таким Post.image. Файл, загруженный снова за последние
+    BLOG_IMAGE_GC_DELAY секунд, не удаляется: его публикация может быть
+    ещё не сохранена.
+    """
+    if image:
+        storage = Post._meta.get_field('image').storage
+        if Post.objects.filter(image=image).exists():
+            return
+        reused_after = timezone.now() - timedelta(
+            seconds=settings.BLOG_IMAGE_GC_DELAY
+        )
+        if (storage.exists(image)
+                and storage.get_modified_time(image) > reused_after):
+            return
+        storage.delete(image)
+    for name in names:
+        default_storage.delete(name)
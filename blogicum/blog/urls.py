@@ -16,6 +16,8 @@ urlpatterns = [
          name='delete_post'),
     path('posts/<int:post_id>/comment/', views.AddCommentView.as_view(),
          name='add_comment'),
+    path('posts/<int:post_id>/comments/', views.PostCommentsView.as_view(),
+         name='post_comments'),
     path('posts/<int:post_id>/comments/<int:pk>/edit/',
          views.EditCommentView.as_view(),
          name='edit_comment'),
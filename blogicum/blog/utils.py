@@ -1,16 +1,34 @@
-from django.db.models import Count
-from django.utils import timezone
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import clock
+
+POST_RELATIONS = ('category', 'author', 'location')
+
+
+def select_post_relations(posts):
+    return posts.select_related(*POST_RELATIONS)
 
 
 def filter_published_posts(posts):
-    return posts.filter(
+    return select_post_relations(posts.filter(
         is_published=True,
-        pub_date__lte=timezone.now(),
+        pub_date__lte=clock.now(),
         category__is_published=True
-    ).annotate(
-        comment_count=Count('comments')
     ).order_by(
         '-pub_date'
-    ).select_related(
-        'category', 'author', 'location'
+    ))
+
+
+def actual_comment_count(comment_model):
+    """Число комментариев публикации подзапросом — для UPDATE по Post."""
+    return Coalesce(
+        Subquery(
+            comment_model.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        0
     )
@@ -1,4 +1,5 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, Http404
 from django.urls import reverse, reverse_lazy
 from django.views.generic import (
@@ -9,37 +10,31 @@ from django.views.generic import (
     UpdateView,
 )
 from django.contrib.auth.views import PasswordChangeView
-from django.core.exceptions import PermissionDenied
+from django.utils.functional import cached_property
 from .forms import (
     CommentCreateForm,
     PostForm,
     EditUserFormTester,
 )
 from .models import Category, Comment, Post, User
-from .mixins import CommentEditMixin, PostsEditMixin, ProfileMixin
-from .utils import filter_published_posts
-
-POSTS_PER_PAGE = 10
-
-
-class ProfileView(ProfileMixin, ListView):
-
-    def get_queryset(self):
-        self.profile_user = self.get_profile_user()
-        queryset = self.get_posts_queryset(self.profile_user)
-
-        if self.request.user != self.profile_user:
-            queryset = filter_published_posts(queryset)
-
-        return queryset
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context.update({
-            'profile': self.profile_user,
-            'is_owner': self.request.user == self.profile_user
-        })
-        return context
+from .mixins import (
+    AnonymousPageCacheMixin,
+    CommentPaginationMixin,
+    CommentEditMixin,
+    FeedMixin,
+    OwnerObjectMixin,
+    PostsEditMixin,
+    ProfileMixin,
+)
+from .caching import (
+    author_page_tag,
+    category_feed,
+    category_page_tag,
+    home_feed,
+    home_page_tag,
+    post_page_tag,
+)
+from .utils import filter_published_posts, select_post_relations
 
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
@@ -67,58 +62,63 @@ class ProfilePasswordChangeView(LoginRequiredMixin, PasswordChangeView):
         )
 
 
-class PostDisplayView(DetailView):
+class PostDisplayView(AnonymousPageCacheMixin, CommentPaginationMixin,
+                      DetailView):
     model = Post
+    use_read_replica = True
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_page_cache_tags(self):
+        return [post_page_tag(self.kwargs['post_id'])]
+
     def get_object(self, queryset=None):
-        post = get_object_or_404(Post, pk=self.kwargs['post_id'])
+        post = get_object_or_404(
+            select_post_relations(Post.objects.all()),
+            pk=self.kwargs['post_id']
+        )
         if not post.is_published and self.request.user != post.author:
             raise Http404
         return post
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        comment_page = self.get_comment_page(self.object)
         context.update({
             'form': CommentCreateForm(),
-            'comments': self.object.comments.select_related('author')
+            'comments': comment_page,
+            'comment_page': comment_page,
         })
         return context
 
 
-class PostRemovalView(PostsEditMixin, LoginRequiredMixin, DeleteView):
+class PostCommentsView(PostDisplayView):
+    """Фрагмент со следующей страницей комментариев к публикации."""
+
+    template_name = 'includes/comments.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['is_fragment'] = True
+        return context
+
+
+class PostRemovalView(PostsEditMixin, OwnerObjectMixin, LoginRequiredMixin,
+                      DeleteView):
     model = Post
     success_url = reverse_lazy('blog:index')
     pk_url_kwarg = 'post_id'
 
-    def check_permissions(self, request, *args, **kwargs):
-        obj = get_object_or_404(Post, pk=self.kwargs[self.pk_url_kwarg])
-        if request.user != obj.author:
-            raise PermissionDenied
-        return True
 
-    def dispatch(self, request, *args, **kwargs):
-        self.check_permissions(request, *args, **kwargs)
-        return super().dispatch(request, *args, **kwargs)
-
-
-class PostEditView(PostsEditMixin, LoginRequiredMixin, UpdateView):
+class PostEditView(PostsEditMixin, OwnerObjectMixin, LoginRequiredMixin,
+                   UpdateView):
     form_class = PostForm
     model = Post
     pk_url_kwarg = 'post_id'
 
-    def check_permissions(self, request, *args, **kwargs):
-        obj = get_object_or_404(Post, pk=self.kwargs[self.pk_url_kwarg])
-        if request.user != obj.author:
-            return False
-        return True
-
-    def dispatch(self, request, *args, **kwargs):
-        if not self.check_permissions(request, *args, **kwargs):
-            return redirect('blog:post_detail', post_id=self.kwargs[
-                self.pk_url_kwarg])
-        return super().dispatch(request, *args, **kwargs)
+    def handle_not_owner(self):
+        return redirect('blog:post_detail', post_id=self.kwargs[
+            self.pk_url_kwarg])
 
     def get_success_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.object.pk})
@@ -150,105 +150,78 @@ class AddCommentView(CommentEditMixin, LoginRequiredMixin, CreateView):
         return form
 
     def form_valid(self, form):
-        form = self.prepare_comment(form)
-        return super().form_valid(form)
+        # Счётчик комментариев обновляет сигнал — в той же транзакции.
+        with transaction.atomic():
+            return super().form_valid(self.prepare_comment(form))
 
 
-class RemoveCommentView(CommentEditMixin, LoginRequiredMixin, DeleteView):
+class RemoveCommentView(CommentEditMixin, OwnerObjectMixin,
+                        LoginRequiredMixin, DeleteView):
     model = Comment
     pk_url_kwarg = 'pk'
 
-    def check_permissions(self, request, *args, **kwargs):
-        obj = get_object_or_404(Comment, pk=self.kwargs['pk'])
-        if request.user != obj.author:
-            raise PermissionDenied
-        return True
-
-    def dispatch(self, request, *args, **kwargs):
-        try:
-            self.check_permissions(request, *args, **kwargs)
-        except PermissionDenied:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+    def form_valid(self, form):
+        with transaction.atomic():
+            return super().form_valid(form)
 
 
-class EditCommentView(CommentEditMixin, LoginRequiredMixin, UpdateView):
+class EditCommentView(CommentEditMixin, OwnerObjectMixin, LoginRequiredMixin,
+                      UpdateView):
     model = Comment
     form_class = CommentCreateForm
     pk_url_kwarg = 'pk'
 
-    def check_permissions(self, request, *args, **kwargs):
-        obj = get_object_or_404(Comment, pk=self.kwargs['pk'])
-        if request.user != obj.author:
-            raise PermissionDenied
-        return True
-
-    def dispatch(self, request, *args, **kwargs):
-        try:
-            self.check_permissions(request, *args, **kwargs)
-        except PermissionDenied:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
 
-
-class UserPostsView(ListView):
+class UserPostsView(AnonymousPageCacheMixin, ProfileMixin, ListView):
     model = Post
-    template_name = 'blog/profile.html'
-    paginate_by = POSTS_PER_PAGE
+    use_read_replica = True
 
-    def get_queryset(self):
-        user = get_object_or_404(User, username=self.kwargs['username'])
-        posts = user.posts.all()
-        if self.request.user != user:
-            posts = filter_published_posts(posts)
-        return posts
-
-    def prepare_context(self, context):
-        context['profile'] = get_object_or_404(
-            User, username=self.kwargs['username']
-        )
-        return context
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        if not isinstance(context, dict):
-            context = {}
-
-        profile_user = get_object_or_404(
-            User, username=self.kwargs['username'])
-        context['profile'] = profile_user
-        return context
+    def get_page_cache_tags(self):
+        return [author_page_tag(self.kwargs['username'])]
 
 
-class HomePageView(ListView):
+class HomePageView(AnonymousPageCacheMixin, FeedMixin, ListView):
     model = Post
+    use_read_replica = True
     template_name = 'blog/index.html'
     context_object_name = 'post_list'
-    paginate_by = POSTS_PER_PAGE
-    queryset = filter_published_posts(Post.objects.all())
+
+    def get_queryset(self):
+        return filter_published_posts(Post.objects.all())
+
+    def get_page_cache_tags(self):
+        return [home_page_tag()]
+
+    def get_feed(self):
+        return home_feed()
 
 
-class CategoryPostsView(ListView):
+class CategoryPostsView(AnonymousPageCacheMixin, FeedMixin, ListView):
     model = Post
+    use_read_replica = True
     template_name = 'blog/category.html'
     context_object_name = 'post_list'
-    paginate_by = POSTS_PER_PAGE
 
-    def get_queryset(self):
-        category = get_object_or_404(
+    def get_page_cache_tags(self):
+        return [category_page_tag(self.kwargs['category_slug'])]
+
+    @cached_property
+    def category(self):
+        return get_object_or_404(
             Category,
             slug=self.kwargs['category_slug'],
             is_published=True
         )
+
+    def get_queryset(self):
         return filter_published_posts(
-            Post.objects.filter(category=category)
+            Post.objects.filter(category=self.category)
         )
 
+    def get_feed(self):
+        return category_feed(self.category.pk)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        context['category'] = self.category
         return context
@@ -0,0 +1,143 @@
+"""Отдача файлов из MEDIA_ROOT.
+
+Поддерживает условные запросы (ETag, Last-Modified), один диапазон
+Range и передачу отдачи nginx через X-Accel-Redirect. Имена файлов
+с хэшем содержимого (см. blog.storage.HashedStorage) кэшируются
+браузером навсегда.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+HASHED_NAME = re.compile(r'(?:^|/)([0-9a-f]{64})(?:_\d+)?\.\w+$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CHUNK_SIZE = 64 * 1024
+
+
+def _etag(path, stat):
+    match = HASHED_NAME.search(path)
+    if match:
+        # Содержимое файла однозначно задаётся именем.
+        return quote_etag(match.group(0).rsplit('/', 1)[-1])
+    return 'W/' + quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+
+
+def _cache_control(path):
+    if HASHED_NAME.search(path):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.BLOG_MEDIA_MAX_AGE}'
+
+
+def _byte_range(request, headers, size):
+    """Границы запрошенного диапазона (start, end) или None.
+
+    Несколько диапазонов и If-Range, не совпавший с сильным ETag или
+    Last-Modified, дают весь файл, как разрешает RFC 9110.
+    Невыполнимый диапазон — ValueError.
+    """
+    header = request.headers.get('Range')
+    if not header:
+        return None
+    if_range = request.headers.get('If-Range')
+    validators = {headers['Last-Modified']}
+    if not headers['ETag'].startswith('W/'):
+        validators.add(headers['ETag'])
+    if if_range and if_range not in validators:
+        return None
+    match = RANGE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start:
+        start, end = int(start), min(int(end or size - 1), size - 1)
+    else:
+        start, end = max(size - int(end), 0), size - 1
+    if start > end or start >= size:
+        raise ValueError
+    return start, end
+
+
+def _read(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (OSError, ValueError, SuspiciousFileOperation):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    etag = _etag(path, stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': _cache_control(path),
+        'Accept-Ranges': 'bytes',
+    }
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if not_modified is not None:
+        for name, value in headers.items():
+            not_modified[name] = value
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    accel_prefix = settings.BLOG_MEDIA_ACCEL_REDIRECT
+    if accel_prefix:
+        # Файл, Range и sendfile обслуживает nginx (internal location).
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response['X-Accel-Redirect'] = accel_prefix + path
+        return response
+
+    response = _file_response(request, full_path, headers, stat.st_size)
+    response['Content-Type'] = content_type
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
+
+
+def _file_response(request, full_path, headers, size):
+    try:
+        byte_range = _byte_range(request, headers, size)
+    except ValueError:
+        return HttpResponse(
+            status=416, headers={'Content-Range': f'bytes */{size}'}
+        )
+    if byte_range is None:
+        # FileResponse отдаёт файл через wsgi.file_wrapper (sendfile).
+        return FileResponse(open(full_path, 'rb'), headers=headers)
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        _read(full_path, start, end - start + 1),
+        status=206,
+        headers=headers,
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    return response
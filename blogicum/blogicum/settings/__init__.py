@@ -0,0 +1,11 @@
+"""Выбор профиля настроек по переменной окружения DJANGO_ENV.
+
+dev (по умолчанию) — локальная разработка с debug_toolbar,
+prod — боевой профиль, см. prod.py.
+"""
+import os
+
+if os.getenv('DJANGO_ENV', 'dev') == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
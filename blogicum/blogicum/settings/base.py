@@ -0,0 +1,245 @@
+"""
+Django settings for blogicum project: common part for all profiles.
+
+The profile is chosen by the DJANGO_ENV environment variable, see
+blogicum/settings/__init__.py.
+
+Generated by 'django-admin startproject' using Django 5.1.1.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.1/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-gwxkn9!5ngf4s+m$1d_v7-_fmqji%dguui1(2_99@%ya)!g9h0'
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host for host in os.getenv('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'users.apps.UsersConfig',
+    'taskqueue.apps.TaskQueueConfig',
+    'search.apps.SearchConfig',
+    'django_bootstrap5',
+    'error_handlers',
+]
+
+MIDDLEWARE = [
+    'blog.middleware.RequestMetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.RequestClockMiddleware',
+    'blog.middleware.ReadReplicaMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+# Реплика только для чтения, например копия основного файла SQLite.
+# В тестах она зеркалит основную базу.
+if os.getenv('DJANGO_SQLITE_REPLICA_PATH'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DJANGO_SQLITE_REPLICA_PATH'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blog.routers.ReadReplicaRouter']
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.1/topics/i18n/
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.1/howto/static-files/
+
+STATIC_URL = 'static/'
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+# Письма уходят через очередь задач, а отправляет их воркер
+# (manage.py run_tasks) бэкендом TASKS_EMAIL_BACKEND.
+EMAIL_BACKEND = 'taskqueue.mail.QueuedEmailBackend'
+TASKS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails/'
+
+MEDIA_ROOT = BASE_DIR / 'media/'
+
+MEDIA_URL = '/media/'
+
+# Время кэширования медиафайлов без хэша в имени, в секундах.
+BLOG_MEDIA_MAX_AGE = 60 * 60
+# Префикс internal-location nginx: файлы отдаёт nginx по заголовку
+# X-Accel-Redirect. None — файлы отдаёт Django.
+BLOG_MEDIA_ACCEL_REDIRECT = os.getenv('DJANGO_MEDIA_ACCEL_REDIRECT') or None
+# Через сколько секунд удаляются файлы изображения, на которое
+# перестали ссылаться публикации.
+BLOG_IMAGE_GC_DELAY = 60 * 60
+
+CSRF_FAILURE_VIEW = 'error_handlers.views.csrf_failure'
+
+# Режим пагинации лент: 'offset' (номера страниц) или 'cursor' (keyset).
+BLOG_FEED_PAGINATION = 'offset'
+
+# Время жизни закэшированного числа публикаций в ленте, в секундах.
+BLOG_FEED_COUNT_TIMEOUT = 60
+
+# Время жизни страниц лент и публикаций в кэше для анонимных
+# посетителей, в секундах; 0 отключает кэш страниц.
+BLOG_PAGE_CACHE_TIMEOUT = 300
+
+# Шаг округления «сейчас» для фильтров по дате публикации, в секундах.
+BLOG_CLOCK_GRANULARITY = 60
+
+# Замер числа запросов к БД, времени БД и рендеринга для каждого
+# запроса: лог `blog.metrics` и заголовок Server-Timing.
+BLOG_REQUEST_METRICS = False
+
+# Псевдоним базы-реплики для представлений с use_read_replica = True
+# и время, на которое после записи посетитель «прилипает» к основной
+# базе, в секундах.
+BLOG_READ_REPLICA = 'replica'
+BLOG_REPLICA_STICKY_COOKIE = 'replica_sticky'
+BLOG_REPLICA_STICKY_SECONDS = 10
+
+# Прагмы для каждого нового соединения с SQLite (см. blog/sqlite.py).
+# WAL: читатели не блокируют писателя и наоборот; synchronous=NORMAL
+# в режиме WAL не ждёт fsync на каждой фиксации.
+BLOG_SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    # Ожидание блокировки записи вместо ошибки, мс.
+    'busy_timeout': int(os.getenv('DJANGO_SQLITE_BUSY_TIMEOUT', 5000)),
+    # Отрицательное значение — размер кэша страниц в КиБ.
+    'cache_size': int(os.getenv('DJANGO_SQLITE_CACHE_SIZE', -20000)),
+    'mmap_size': int(os.getenv('DJANGO_SQLITE_MMAP_SIZE', 128 * 2 ** 20)),
+}
+
+# Бэкенд поиска по публикациям (см. search/backends.py).
+BLOG_SEARCH_BACKEND = 'search.backends.FTS5SearchBackend'
+
+# Очередь задач: True выполняет задачи сразу в запросе, без воркера.
+TASKS_ALWAYS_EAGER = False
+# Через сколько секунд задача упавшего воркера возвращается в очередь.
+TASKS_LOCK_TIMEOUT = 600
+# Пауза перед повтором упавшей задачи, удваивается с каждой попыткой, с.
+TASKS_RETRY_DELAY = 30
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blog.metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
@@ -0,0 +1,23 @@
+"""Настройки для локальной разработки."""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = True
+
+INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+
+# Панель отладки ставится сразу после CommonMiddleware.
+MIDDLEWARE = [*MIDDLEWARE]
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.common.CommonMiddleware') + 1,
+    'debug_toolbar.middleware.DebugToolbarMiddleware',
+)
+
+# Без воркера задачи выполняются прямо в запросе;
+# DJANGO_TASKS_EAGER=0 включает настоящую очередь.
+TASKS_ALWAYS_EAGER = os.getenv('DJANGO_TASKS_EAGER', '1') == '1'
+# Без очереди отложить удаление изображений нельзя.
+if TASKS_ALWAYS_EAGER:
+    BLOG_IMAGE_GC_DELAY = 0
@@ -0,0 +1,33 @@
+"""Боевые настройки.
+
+Секретный ключ и список хостов обязательно задаются через
+DJANGO_SECRET_KEY и DJANGO_ALLOWED_HOSTS.
+"""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+# Соединение с БД переиспользуется между запросами одного воркера.
+DATABASES['default'].update({
+    'CONN_MAX_AGE': int(os.getenv('DJANGO_CONN_MAX_AGE', 600)),
+    'CONN_HEALTH_CHECKS': True,
+})
+# Писатель сразу берёт блокировку записи и ждёт её busy_timeout,
+# а не падает с «database is locked» при повышении блокировки.
+DATABASES['default'].setdefault('OPTIONS', {}).update({
+    'transaction_mode': 'IMMEDIATE',
+})
+
+# Шаблоны компилируются один раз на процесс.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
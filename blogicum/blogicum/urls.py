@@ -17,19 +17,26 @@ Including another URLconf
 # blogicum/urls.py
 
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from users.views import logout_user
 
+from .media import serve_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('search/', include('search.urls', namespace='search')),
     path('users/', include('users.urls')),
     path('auth/logout/', logout_user, name='logout'),
     path('auth/', include('django.contrib.auth.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(
+        rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$',
+        serve_media,
+        name='media'
+    ),
+]
 
 handler403 = 'error_handlers.views.csrf_failure'
 handler404 = 'error_handlers.views.page_not_found'
@@ -0,0 +1,48 @@
+"""Разбор текста для поискового индекса.
+
+Текст приводится к нижнему регистру, «ё» заменяется на «е», слова
+сводятся к основам стеммером Snowball: русским для кириллицы,
+английским для остальных. Одинаково разбираются и публикации при
+индексации, и запросы, поэтому «прогулки» находит «прогулку».
+"""
+import re
+import threading
+from functools import lru_cache
+
+import snowballstemmer
+
+WORD = re.compile(r'\w+')
+CYRILLIC = re.compile('[а-я]')
+
+# Объекты стеммеров хранят состояние разбора и не потокобезопасны.
+_local = threading.local()
+
+
+def _stemmer(language):
+    stemmers = getattr(_local, 'stemmers', None)
+    if stemmers is None:
+        stemmers = _local.stemmers = {}
+    if language not in stemmers:
+        stemmers[language] = snowballstemmer.stemmer(language)
+    return stemmers[language]
+
+
+def tokenize(text):
+    return WORD.findall(text.lower().replace('ё', 'е'))
+
+
+# Словарь текстов невелик по сравнению с числом слов в них.
+@lru_cache(maxsize=100_000)
+def stem(word):
+    language = 'russian' if CYRILLIC.search(word) else 'english'
+    return _stemmer(language).stemWord(word)
+
+
+def terms(text):
+    """Основы слов текста в исходном порядке."""
+    return [stem(word) for word in tokenize(text)]
+
+
+def analyze(text):
+    """Строка основ, которую FTS5 хранит вместо исходного текста."""
+    return ' '.join(terms(text))
@@ -0,0 +1,139 @@
+"""Бэкенды полнотекстового поиска по публикациям.
+
+Бэкенд выбирается настройкой BLOG_SEARCH_BACKEND и реализует
+интерфейс BaseSearchBackend: поддерживает свой индекс в актуальном
+состоянии и отбирает публикации из переданного queryset, добавляя
+аннотацию search_rank (чем меньше, тем релевантнее).
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .analysis import WORD, analyze, terms
+
+
+class BaseSearchBackend(ABC):
+    """Бэкенд без собственного индекса переопределяет только search()."""
+
+    def index(self, post):
+        """Добавляет или обновляет публикацию в индексе её базы."""
+
+    def remove(self, post_id, using=DEFAULT_DB_ALIAS):
+        """Убирает публикацию из индекса базы using."""
+
+    def rebuild(self, posts):
+        """Перестраивает индекс базы queryset по его публикациям."""
+
+    @abstractmethod
+    def search(self, queryset, query):
+        """Отбирает публикации по запросу с аннотацией search_rank."""
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Поиск подстрокой LIKE без индекса: полный просмотр таблицы."""
+
+    def search(self, queryset, query):
+        words = WORD.findall(query)
+        if not words:
+            return queryset.none()
+        condition = Q()
+        in_title = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+            in_title &= Q(title__icontains=word)
+        return queryset.filter(condition).annotate(
+            search_rank=Case(
+                When(in_title, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        ).order_by('search_rank', '-pub_date')
+
+
+class FTS5SearchBackend(BaseSearchBackend):
+    """Инвертированный индекс SQLite FTS5 с ранжированием BM25.
+
+    Таблицу search_post_fts создаёт миграция приложения search; она же
+    задаёт ранжирование bm25 с повышенным весом заголовка. Публикации
+    соединяются с индексом по rowid (модель PostSearchEntry), так что
+    MATCH выполняется один раз на запрос.
+
+    В индекс записываются не исходные тексты, а основы слов
+    (search.analysis): словоформы сводятся при сохранении публикации,
+    а запрос разбирается тем же способом.
+    """
+
+    table = 'search_post_fts'
+
+    @staticmethod
+    def document(pk, title, text):
+        return pk, analyze(title), analyze(text)
+
+    def index(self, post):
+        using = post._state.db or DEFAULT_DB_ALIAS
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                self.document(post.pk, post.title, post.text),
+            )
+
+    def remove(self, post_id, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post_id]
+            )
+
+    def rebuild(self, posts):
+        with connections[posts.db].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                (
+                    self.document(*row) for row in
+                    posts.values_list('pk', 'title', 'text').iterator()
+                ),
+            )
+
+    @staticmethod
+    def match_expression(query):
+        # Каждая основа в кавычках: синтаксис FTS5 из запроса
+        # посетителя не интерпретируется. Последнее слово ищется
+        # как префикс, пока его ещё набирают.
+        stems = terms(query)
+        if not stems:
+            return None
+        phrases = [f'"{stem}"' for stem in stems]
+        phrases[-1] += '*'
+        return ' '.join(phrases)
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(
+            search_entry__document__match=match
+        ).annotate(
+            search_rank=F('search_entry__rank')
+        ).order_by('search_rank', '-pub_date')
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.BLOG_SEARCH_BACKEND)()
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    if setting == 'BLOG_SEARCH_BACKEND':
+        get_backend.cache_clear()
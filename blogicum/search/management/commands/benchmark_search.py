@@ -0,0 +1,58 @@
+import random
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.utils import filter_published_posts
+from search.backends import WORD, FTS5SearchBackend, LikeSearchBackend
+
+BACKENDS = (
+    ('LIKE', LikeSearchBackend()),
+    ('FTS5', FTS5SearchBackend()),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время поиска LIKE и FTS5 на текущих данных: '
+        'первая страница результатов и их число.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*',
+                            help='Запросы; по умолчанию слова из публикаций.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--limit', type=int, default=10)
+
+    def handle(self, *args, queries, repeat, limit, **options):
+        queries = queries or self.sample_queries()
+        if not queries:
+            self.stdout.write('Нет публикаций для выбора запросов.')
+            return
+        for title, backend in BACKENDS:
+            timings = []
+            for query in queries:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    found = backend.search(
+                        filter_published_posts(Post.objects.all()), query
+                    )
+                    list(found[:limit])
+                    found.count()
+                    timings.append(time.perf_counter() - started)
+            self.stdout.write(
+                f'{title}: медиана {median(timings) * 1000:.1f} мс, '
+                f'максимум {max(timings) * 1000:.1f} мс '
+                f'на {len(queries)} запросах'
+            )
+
+    @staticmethod
+    def sample_queries(count=10):
+        texts = Post.objects.order_by('?').values_list('title', flat=True)
+        words = [
+            word for title in texts[:count * 5]
+            for word in WORD.findall(title) if len(word) > 3
+        ]
+        return random.sample(words, min(count, len(words)))
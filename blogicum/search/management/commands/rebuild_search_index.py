@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.models import Post
+from search.backends import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, database, **options):
+        posts = Post.objects.using(database)
+        get_backend().rebuild(posts.order_by('pk'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано публикаций: {posts.count()}'
+        ))
@@ -0,0 +1,60 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import search.models
+
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_post_fts USING fts5("
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+)
+# Ранжирование по умолчанию: совпадение в заголовке весит как десять
+# совпадений в тексте.
+SET_RANK = (
+    "INSERT INTO search_post_fts (search_post_fts, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')"
+)
+
+
+def create_index(apps, schema_editor):
+    # FTS5 есть только в SQLite; на других СУБД нужен другой бэкенд.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Post = apps.get_model('blog', 'Post')
+    schema_editor.execute(CREATE_TABLE)
+    schema_editor.execute(SET_RANK)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO search_post_fts (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            Post.objects.values_list('pk', 'title', 'text').iterator(),
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS search_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_image_hashed_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+        migrations.CreateModel(
+            name='PostSearchEntry',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='blog.post')),
+                ('title', models.TextField()),
+                ('text', models.TextField()),
+                ('document', search.models.FTSDocumentField(db_column='search_post_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'search_post_fts',
+                'managed': False,
+            },
+        ),
+    ]
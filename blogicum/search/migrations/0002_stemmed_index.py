@@ -0,0 +1,38 @@
+from django.db import migrations
+
+from search.analysis import analyze
+
+
+def fill_index(apps, schema_editor, prepare):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Post = apps.get_model('blog', 'Post')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DELETE FROM search_post_fts')
+        cursor.executemany(
+            'INSERT INTO search_post_fts (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            (
+                (pk, prepare(title), prepare(text)) for pk, title, text in
+                Post.objects.values_list('pk', 'title', 'text').iterator()
+            ),
+        )
+
+
+def index_stems(apps, schema_editor):
+    fill_index(apps, schema_editor, analyze)
+
+
+def index_texts(apps, schema_editor):
+    fill_index(apps, schema_editor, str)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_post_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_stems, index_texts),
+    ]
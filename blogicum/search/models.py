@@ -0,0 +1,45 @@
+from django.db import models
+from django.db.models import Lookup
+
+from blog.models import Post
+
+
+class FTSDocumentField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы — левая часть MATCH."""
+
+
+@FTSDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class PostSearchEntry(models.Model):
+    """Строка индекса FTS5; rowid совпадает с id публикации.
+
+    В title и text хранятся основы слов, а не исходный текст.
+
+    Таблицу создаёт миграция, модель нужна только для JOIN
+    с публикациями; записывает в индекс FTS5SearchBackend.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name='search_entry'
+    )
+    title = models.TextField()
+    text = models.TextField()
+    document = FTSDocumentField(db_column='search_post_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'search_post_fts'
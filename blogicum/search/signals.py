@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.models import Post
+
+from .backends import get_backend
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    # Индексируются и сохранения из фикстур (loaddata): индексу нужны
+    # только поля самой публикации.
+    get_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post(sender, instance, using, **kwargs):
+    get_backend().remove(instance.pk, using=using)
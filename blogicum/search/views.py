@@ -0,0 +1,38 @@
+from urllib.parse import urlencode
+
+from django.views.generic import ListView
+
+from blog.mixins import POSTS_PER_PAGE
+from blog.models import Post
+from blog.pagination import CachedCountPaginator
+from blog.utils import filter_published_posts
+
+from .backends import get_backend
+
+MAX_QUERY_LENGTH = 200
+
+
+class SearchView(ListView):
+    """Поиск по опубликованным публикациям, от релевантных к остальным."""
+
+    template_name = 'search/results.html'
+    paginate_by = POSTS_PER_PAGE
+    paginator_class = CachedCountPaginator
+    use_read_replica = True
+
+    def get_query(self):
+        return self.request.GET.get('q', '').strip()[:MAX_QUERY_LENGTH]
+
+    def get_queryset(self):
+        return get_backend().search(
+            filter_published_posts(Post.objects.all()), self.get_query()
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.get_query()
+        context.update({
+            'query': query,
+            'extra_query': urlencode({'q': query}) + '&' if query else '',
+        })
+        return context
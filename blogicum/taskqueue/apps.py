@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+from django.utils.translation import gettext_lazy as _
+
+
+class TaskQueueConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'taskqueue'
+    verbose_name = _('Очередь задач')
+
+    def ready(self):
+        # Задачи регистрируются декоратором @task в модулях tasks.py.
+        autodiscover_modules('tasks')
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .registry import enqueue
+from .tasks import send_email
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь; отправляет их TASKS_EMAIL_BACKEND.
+
+    Письма с вложениями отправляются сразу: их не сериализуем.
+    """
+
+    def send_messages(self, email_messages):
+        sent = 0
+        for message in email_messages:
+            if message.attachments:
+                sent += get_connection(
+                    settings.TASKS_EMAIL_BACKEND,
+                    fail_silently=self.fail_silently,
+                ).send_messages([message])
+                continue
+            enqueue(send_email, message=_serialize(message))
+            sent += 1
+        return sent
+
+
+def _serialize(message):
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': [
+            list(alternative)
+            for alternative in getattr(message, 'alternatives', ())
+        ],
+    }
@@ -0,0 +1,77 @@
+import logging
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from taskqueue.worker import claim, execute, requeue_stale
+
+logger = logging.getLogger(__name__)
+
+
+def _init_process():
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = 'Выполняет задачи из очереди в пуле потоков или процессов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pool', choices=('thread', 'process'),
+                            default='thread')
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Пауза между опросами пустой очереди, с.')
+        parser.add_argument('--once', action='store_true',
+                            help='Выйти, когда очередь опустеет.')
+
+    def handle(self, *args, **options):
+        if options['pool'] == 'process':
+            # Дочерние процессы не должны наследовать открытые соединения.
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                options['workers'], initializer=_init_process
+            )
+        else:
+            executor = ThreadPoolExecutor(options['workers'])
+        done = 0
+        try:
+            done = self.run(executor, options)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            executor.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS(f'Выполнено задач: {done}'))
+
+    def run(self, executor, options):
+        inflight = set()
+        done = 0
+        while True:
+            requeue_stale()
+            free = options['workers'] - len(inflight)
+            for pk in claim(free) if free else ():
+                inflight.add(executor.submit(execute, pk))
+            if not inflight:
+                if options['once']:
+                    return done
+                time.sleep(options['poll_interval'])
+                continue
+            finished, inflight = wait(
+                inflight, timeout=options['poll_interval'],
+                return_when=FIRST_COMPLETED,
+            )
+            for future in finished:
+                # Ошибки задач execute() обрабатывает сам; здесь остаются
+                # сбои самого воркера, и они не должны останавливать цикл.
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception('Сбой выполнения задачи в пуле')
+            done += len(finished)
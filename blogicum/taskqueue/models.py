@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Task(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('В очереди')
+        RUNNING = 'running', _('Выполняется')
+        FAILED = 'failed', _('Ошибка')
+
+    name = models.CharField(_('Задача'), max_length=200)
+    payload = models.JSONField(_('Аргументы'), default=dict)
+    status = models.CharField(
+        _('Статус'),
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_('Попыток'), default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        _('Максимум попыток'),
+        default=3
+    )
+    run_after = models.DateTimeField(
+        _('Выполнить после'),
+        default=timezone.now
+    )
+    locked_at = models.DateTimeField(_('Взята в работу'), null=True,
+                                     blank=True)
+    last_error = models.TextField(_('Последняя ошибка'), blank=True)
+    created_at = models.DateTimeField(_('Добавлено'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('задача')
+        verbose_name_plural = _('Задачи')
+        indexes = (
+            models.Index(
+                fields=('run_after', 'id'),
+                condition=models.Q(status='pending'),
+                name='task_pending_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
@@ -0,0 +1,47 @@
+"""Регистрация и постановка задач в очередь.
+
+Задача — функция с именованными JSON-сериализуемыми аргументами,
+помеченная декоратором @task. enqueue() сохраняет её в таблицу Task
+в текущей транзакции: воркер увидит задачу только после фиксации.
+При TASKS_ALWAYS_EAGER задача выполняется сразу, без очереди.
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+_registry = {}
+
+
+def task(name=None, max_attempts=3):
+    def decorator(func):
+        func.task_name = name or f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts
+        _registry[func.task_name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    return _registry[name]
+
+
+def enqueue(func, **kwargs):
+    return enqueue_later(0, func, **kwargs)
+
+
+def enqueue_later(delay, func, **kwargs):
+    """Как enqueue(), но воркер возьмёт задачу не раньше чем через delay с."""
+    # Прогон через JSON даёт одинаковые аргументы в обоих режимах.
+    payload = json.loads(json.dumps(kwargs))
+    if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+        func(**payload)
+        return None
+    from .models import Task
+    return Task.objects.create(
+        name=func.task_name,
+        payload=payload,
+        max_attempts=func.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
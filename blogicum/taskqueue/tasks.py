@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.mail import (
+    EmailMessage,
+    EmailMultiAlternatives,
+    get_connection,
+)
+
+from .registry import task
+
+
+@task(name='taskqueue.send_email', max_attempts=5)
+def send_email(message):
+    alternatives = message.pop('alternatives')
+    email_class = EmailMultiAlternatives if alternatives else EmailMessage
+    email = email_class(
+        connection=get_connection(settings.TASKS_EMAIL_BACKEND), **message
+    )
+    for content, mimetype in alternatives:
+        email.attach_alternative(content, mimetype)
+    email.send()
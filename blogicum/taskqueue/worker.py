@@ -0,0 +1,82 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи, зависшие у упавшего воркера.
+
+    Задача, исчерпавшая попытки, помечается неудавшейся: иначе задача,
+    которая роняет воркер, выполнялась бы бесконечно.
+    """
+    timeout = timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    stale = Task.objects.filter(
+        status=Task.Status.RUNNING,
+        locked_at__lt=timezone.now() - timeout
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.Status.FAILED,
+        locked_at=None,
+        last_error='Воркер не завершил задачу за TASKS_LOCK_TIMEOUT.',
+    )
+    return stale.update(status=Task.Status.PENDING)
+
+
+def claim(limit):
+    """Забирает до limit готовых задач и возвращает их id.
+
+    В SQLite нет SELECT ... FOR UPDATE SKIP LOCKED, поэтому задача
+    достаётся тому воркеру, чей условный UPDATE её изменил.
+    """
+    now = timezone.now()
+    candidates = Task.objects.filter(
+        status=Task.Status.PENDING, run_after__lte=now
+    ).order_by('run_after', 'id').values_list('pk', flat=True)[:limit]
+    return [
+        pk for pk in list(candidates)
+        if Task.objects.filter(pk=pk, status=Task.Status.PENDING).update(
+            status=Task.Status.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+    ]
+
+
+def execute(pk):
+    """Выполняет взятую задачу; успешная задача удаляется."""
+    try:
+        task = Task.objects.get(pk=pk)
+        try:
+            get_task(task.name)(**task.payload)
+        except Exception:
+            logger.exception('Задача %s завершилась ошибкой', task)
+            _retry_or_fail(task, traceback.format_exc())
+        else:
+            task.delete()
+    finally:
+        close_old_connections()
+
+
+def _retry_or_fail(task, error):
+    task.last_error = error
+    task.locked_at = None
+    if task.attempts >= task.max_attempts:
+        task.status = Task.Status.FAILED
+    else:
+        task.status = Task.Status.PENDING
+        task.run_after = timezone.now() + timedelta(
+            seconds=settings.TASKS_RETRY_DELAY * 2 ** (task.attempts - 1)
+        )
+    task.save(update_fields=(
+        'last_error', 'locked_at', 'status', 'run_after'
+    ))
@@ -0,0 +1,219 @@
+"""Бюджеты числа запросов и времени ответа для маршрутов `blog/urls.py`.
+
+По умолчанию данных немного: проверяются число запросов и планы
+запросов (EXPLAIN), которые не зависят от скорости машины.
+BLOG_BUDGET_SCALE=1 включает нагрузочный прогон: объёмы как в
+рабочей базе и сверку p95 времени ответа с бюджетом.
+
+Объём данных и число замеров задаются переменными окружения:
+BLOG_BUDGET_POSTS, BLOG_BUDGET_COMMENTS, BLOG_BUDGET_SAMPLES.
+BLOG_BUDGET_LATENCY_SCALE растягивает бюджеты времени на медленных
+машинах.
+"""
+import os
+import random
+import time
+from datetime import timedelta
+from io import StringIO
+from statistics import quantiles
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from blog import urls as blog_urls
+from blog.models import Category, Comment, Location, Post
+
+SCALE = bool(os.getenv("BLOG_BUDGET_SCALE"))
+N_POSTS = int(os.getenv("BLOG_BUDGET_POSTS", 100_000 if SCALE else 300))
+N_COMMENTS = int(
+    os.getenv("BLOG_BUDGET_COMMENTS", 1_000_000 if SCALE else 1500)
+)
+N_SAMPLES = int(os.getenv("BLOG_BUDGET_SAMPLES", 20))
+LATENCY_SCALE = float(os.getenv("BLOG_BUDGET_LATENCY_SCALE", 1))
+N_USERS = 50
+N_CATEGORIES = 10
+BATCH_SIZE = 1000
+# Таблицы, полный просмотр которых растёт с объёмом данных.
+LARGE_TABLES = ("blog_post", "blog_comment", "auth_user")
+
+# Маршрут: (метод, максимум запросов, p95 в миллисекундах).
+# В число запросов входят два запроса сессии и пользователя.
+BUDGETS = {
+    "index": ("get", 3, 150),
+    "post_detail": ("get", 4, 150),
+    "post_comments": ("get", 4, 150),
+    "create_post": ("get", 4, 150),
+    "edit_post": ("get", 5, 150),
+    "delete_post": ("get", 3, 100),
+    "add_comment": ("post", 8, 150),
+    "edit_comment": ("get", 3, 100),
+    "delete_comment": ("get", 3, 100),
+    "edit_profile": ("get", 2, 100),
+    "profile": ("get", 4, 150),
+    "category_posts": ("get", 4, 150),
+    "registration": ("get", 2, 100),
+}
+
+User = get_user_model()
+
+
+def _seed():
+    rng = random.Random(2024)
+    now = timezone.now()
+    users = User.objects.bulk_create(
+        User(username=f"budget_user_{i}") for i in range(N_USERS)
+    )
+    categories = Category.objects.bulk_create(
+        Category(
+            title=f"Категория {i}",
+            description="Описание",
+            slug=f"budget-category-{i}",
+        )
+        for i in range(N_CATEGORIES)
+    )
+    locations = Location.objects.bulk_create(
+        Location(name=f"Место {i}") for i in range(N_CATEGORIES)
+    )
+    posts = Post.objects.bulk_create(
+        (
+            Post(
+                title=f"Публикация {i}",
+                text="Текст публикации. " * 20,
+                pub_date=now - timedelta(minutes=i),
+                author=users[i % N_USERS],
+                category=categories[i % N_CATEGORIES],
+                location=locations[i % N_CATEGORIES],
+            )
+            for i in range(N_POSTS)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    # Популярные публикации собирают большую часть комментариев.
+    weights = [1 / (rank + 1) for rank in range(len(posts))]
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                post=post,
+                author=users[i % N_USERS],
+                text=f"Комментарий {i}",
+            )
+            for i, post in enumerate(
+                rng.choices(posts, weights=weights, k=N_COMMENTS)
+            )
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    call_command("rebuild_comment_counts", stdout=StringIO())
+    return users[0], categories[0], posts[0]
+
+
+@pytest.fixture(scope="module")
+def seeded_blog(django_db_setup, django_db_blocker):
+    # Данные живут во внешней транзакции модуля: тесты работают
+    # в точках сохранения внутри неё, а откат в конце удаляет ровно
+    # созданные здесь строки.
+    with django_db_blocker.unblock(), transaction.atomic():
+        author, category, post = _seed()
+        comment = post.comments.filter(author=author).first() or (
+            Comment.objects.create(post=post, author=author, text="Мой")
+        )
+        yield {
+            "author": author,
+            "post_id": post.id,
+            "pk": comment.id,
+            "username": author.username,
+            "category_slug": category.slug,
+        }
+        transaction.set_rollback(True)
+
+
+def _full_scans(queries):
+    """Полные просмотры больших таблиц в планах запросов SQLite."""
+    scans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+            for *_, detail in cursor.fetchall():
+                words = detail.split()
+                if (
+                    words[0] == "SCAN" and words[1] in LARGE_TABLES
+                    and "INDEX" not in words
+                ):
+                    scans.append(f"{detail}: {query['sql']}")
+    return scans
+
+
+def _route_url(pattern, seeded_blog):
+    kwargs = {
+        name: seeded_blog[name] for name in pattern.pattern.converters
+    }
+    return reverse(f"blog:{pattern.name}", kwargs=kwargs)
+
+
+def _blog_routes():
+    return [
+        pattern for pattern in blog_urls.urlpatterns
+        if isinstance(pattern, URLPattern)
+    ]
+
+
+def test_every_route_has_budget():
+    missing = {p.name for p in _blog_routes()} - set(BUDGETS)
+    assert not missing, (
+        f"Задайте бюджет запросов и времени для маршрутов: {missing}"
+    )
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+@pytest.mark.parametrize(
+    "pattern", _blog_routes(), ids=lambda pattern: pattern.name
+)
+def test_route_budget(pattern, seeded_blog):
+    method, max_queries, p95_budget = BUDGETS[pattern.name]
+    url = _route_url(pattern, seeded_blog)
+    client = Client()
+    client.force_login(seeded_blog["author"])
+    data = {"text": "Проверка бюджета"} if method == "post" else None
+
+    def request():
+        response = getattr(client, method)(url, data)
+        assert response.status_code < 400, (
+            f"`{url}` ответил статусом {response.status_code}."
+        )
+
+    # Прогрев: кэши числа публикаций и расписания.
+    request()
+    with CaptureQueriesContext(connection) as ctx:
+        request()
+    assert len(ctx) <= max_queries, (
+        f"`{url}` выполнил {len(ctx)} запросов при бюджете {max_queries}:\n"
+        + "\n".join(query["sql"] for query in ctx.captured_queries)
+    )
+
+    if connection.vendor == "sqlite":
+        scans = _full_scans(ctx.captured_queries)
+        assert not scans, (
+            f"`{url}` просматривает таблицы целиком:\n" + "\n".join(scans)
+        )
+
+    if not SCALE or not LATENCY_SCALE:
+        return
+    timings = []
+    for _ in range(N_SAMPLES):
+        started = time.perf_counter()
+        request()
+        timings.append((time.perf_counter() - started) * 1000)
+    p95 = quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    assert p95 <= p95_budget * LATENCY_SCALE, (
+        f"p95 времени ответа `{url}` — {p95:.1f} мс при бюджете"
+        f" {p95_budget * LATENCY_SCALE:.0f} мс."
+    )
@@ -0,0 +1,175 @@
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError, connections
+from django.test import override_settings
+
+from blog.bulkload import BulkLoader, iter_objects
+from blog.models import Comment, Post
+from search.backends import get_backend
+
+OBJECTS = [
+    # Комментарии раньше публикаций: внешние ключи проверяются в конце.
+    {
+        "model": "blog.comment",
+        "pk": 100 + i,
+        "fields": {
+            "text": f"Комментарий {i}",
+            "post": 10 + i % 2,
+            "author": 7,
+            "created_at": "2024-01-01T00:00:00Z",
+        },
+    }
+    for i in range(5)
+] + [
+    {
+        "model": "blog.post",
+        "pk": 10 + i,
+        "fields": {
+            "title": f"Прогулка {i}",
+            "text": "Текст, содержащий [скобки], запятые и \"кавычки\"",
+            "pub_date": "2024-01-01T00:00:00Z",
+            "author": 7,
+            "is_published": True,
+            "created_at": "2024-01-01T00:00:00Z",
+        },
+    }
+    for i in range(2)
+] + [
+    {"model": "auth.user", "pk": 7, "fields": {"username": "loader"}},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("jsonl", [False, True])
+def test_iter_objects_streams_array_and_jsonl(chunk_size, jsonl):
+    if jsonl:
+        data = "\n".join(json.dumps(obj, ensure_ascii=False)
+                         for obj in OBJECTS)
+    else:
+        data = json.dumps(OBJECTS, ensure_ascii=False, indent=2)
+    assert list(iter_objects(io.StringIO(data), chunk_size)) == OBJECTS, (
+        "Убедитесь, что фикстура читается по частям без потери объектов."
+    )
+
+
+def test_iter_objects_rejects_truncated_file():
+    data = json.dumps(OBJECTS)[:-10]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_objects(io.StringIO(data), 64))
+
+
+@pytest.fixture
+def fixture_file(tmp_path):
+    path = tmp_path / "dump.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as stream:
+        json.dump(OBJECTS, stream, ensure_ascii=False)
+    return str(path)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_loaddata_loads_and_rebuilds(fixture_file):
+    out = StringIO()
+    call_command("bulk_loaddata", fixture_file, batch_size=2, stdout=out)
+
+    assert "строк/с" in out.getvalue(), (
+        "Убедитесь, что команда сообщает скорость загрузки."
+    )
+    assert Comment.objects.count() == 5
+    assert dict(Post.objects.values_list("pk", "comment_count")) == {
+        10: 3, 11: 2
+    }, "Убедитесь, что после загрузки пересчитано число комментариев."
+    found = get_backend().search(Post.objects.all(), "прогулки")
+    assert {post.pk for post in found} == {10, 11}, (
+        "Убедитесь, что загруженные публикации попадают в поисковый индекс."
+    )
+
+    # Повторная загрузка обновляет строки с теми же ключами.
+    call_command("bulk_loaddata", fixture_file, stdout=StringIO())
+    assert Post.objects.count() == 2 and Comment.objects.count() == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_loaddata_checks_foreign_keys(tmp_path):
+    path = tmp_path / "broken.jsonl"
+    path.write_text(json.dumps(OBJECTS[0]), encoding="utf-8")
+    with pytest.raises(IntegrityError):
+        call_command("bulk_loaddata", str(path), stdout=StringIO())
+    assert not Comment.objects.exists(), (
+        "Убедитесь, что при нарушении внешних ключей загрузка откатывается."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_loader_upserts_raw():
+    # Загрузчик вставляет строки в обход pre_save и обновляет
+    # существующие по первичному ключу, как loaddata.
+    user, post, other = OBJECTS[-1], OBJECTS[5], OBJECTS[6]
+    loader = BulkLoader(batch_size=10)
+    loader.load([user, post])
+    loader.finish()
+    assert Post.objects.get(pk=10).created_at == datetime(
+        2024, 1, 1, tzinfo=timezone.utc
+    ), "Убедитесь, что auto_now_add не перезаписывает даты из фикстуры."
+
+    changed = {**post, "fields": {
+        **post["fields"],
+        "title": "Новый заголовок",
+        "created_at": "2023-06-01T00:00:00Z",
+    }}
+    loader = BulkLoader(batch_size=10)
+    loader.load([changed, other])
+    loader.finish()
+    assert dict(Post.objects.values_list("pk", "title")) == {
+        10: "Новый заголовок", 11: "Прогулка 1"
+    }, "Убедитесь, что строки с существующим ключом обновляются."
+    assert Post.objects.get(pk=10).created_at == datetime(
+        2023, 6, 1, tzinfo=timezone.utc
+    )
+
+
+@pytest.fixture
+def other_database(request, tmp_path):
+    # Вторая база — отдельный файл SQLite со схемой основной базы.
+    databases = connections.configure_settings({
+        **settings.DATABASES,
+        "other": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": str(tmp_path / "other.sqlite3"),
+        },
+    })
+    connections.settings["other"] = databases["other"]
+    request.applymarker(pytest.mark.django_db(
+        transaction=True, databases=["default", "other"]
+    ))
+    request.getfixturevalue("transactional_db")
+    source, target = connections["default"], connections["other"]
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
+    with override_settings(DATABASES=databases):
+        yield "other"
+    connections["other"].close()
+    del connections["other"]
+    del connections.settings["other"]
+
+
+def test_bulk_loaddata_rebuilds_target_database(fixture_file, other_database):
+    call_command("bulk_loaddata", fixture_file, database=other_database,
+                 stdout=StringIO())
+
+    assert not Post.objects.exists()
+    posts = Post.objects.using(other_database)
+    assert dict(posts.values_list("pk", "comment_count")) == {
+        10: 3, 11: 2
+    }, "Убедитесь, что число комментариев пересчитывается в базе загрузки."
+    found = get_backend().search(posts.all(), "прогулки")
+    assert {post.pk for post in found} == {10, 11}, (
+        "Убедитесь, что поисковый индекс перестраивается в базе загрузки."
+    )
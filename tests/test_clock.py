@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from blog import clock
+from blog.middleware import RequestClockMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_CLOCK_GRANULARITY=60)
+def test_truncate_and_visible_at():
+    moment = datetime(2024, 5, 1, 12, 30, 45, tzinfo=dt_timezone.utc)
+    assert clock.truncate(moment) == moment.replace(second=0)
+    assert clock.visible_at(moment) == moment.replace(minute=31, second=0)
+    exact = moment.replace(second=0)
+    assert clock.visible_at(exact) == exact
+
+
+@override_settings(BLOG_CLOCK_GRANULARITY=60)
+def test_middleware_freezes_truncated_now():
+    seen = []
+
+    def view(request):
+        seen.append(clock.now())
+        seen.append(clock.now())
+
+    RequestClockMiddleware(view)(RequestFactory().get("/"))
+
+    assert seen[0] == seen[1], (
+        "Убедитесь, что в пределах запроса `clock.now()` не меняется."
+    )
+    assert seen[0].second == 0 and seen[0].microsecond == 0
+    assert timezone.now() - seen[0] < timedelta(minutes=1)
+
+
+@override_settings(BLOG_CLOCK_GRANULARITY=1)
+def test_home_feed_cutoff_is_not_frozen(
+        mixer, user_client, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(seconds=2),
+    )
+    response = user_client.get("/")
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что граница публикации на главной странице вычисляется"
+        " при каждом запросе, а не один раз при импорте модуля."
+    )
@@ -0,0 +1,118 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comment_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for text in ("Первый", "Второй"):
+        user_client.post(f"/posts/{post.id}/comment/", {"text": text})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что добавление комментария увеличивает счётчик"
+        " комментариев публикации."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/comments/{comment.id}/delete/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментария уменьшает счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_rebuild_comment_counts(mixer, comment_to_a_post):
+    post = Post.objects.get(pk=comment_to_a_post.post_id)
+    mixer.blend("blog.Comment", post=post)
+    # Счётчик разошёлся с таблицей, например после правки в базе.
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+
+    call_command("rebuild_comment_counts")
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `rebuild_comment_counts` пересчитывает"
+        " число комментариев публикаций."
+    )
+
+
+def test_comment_count_follows_deletes_outside_views(
+        mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    post.refresh_from_db()
+    assert post.comment_count == 4, (
+        "Убедитесь, что счётчик растёт при любом создании комментария."
+    )
+
+    comments[0].delete()
+    Comment.objects.filter(pk=comments[1].pk).delete()
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик уменьшается при удалении комментариев "
+        "в админке, через QuerySet.delete() и каскадом."
+    )
+
+
+def test_comment_count_never_goes_negative(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+
+    comment.delete()
+
+    post.refresh_from_db()
+    assert post.comment_count == 0
+
+
+def _post_updates(queries):
+    return [query["sql"] for query in queries
+            if query["sql"].startswith('UPDATE "blog_post"')]
+
+
+def test_post_delete_does_not_update_its_own_counter(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(20).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    assert not _post_updates(queries), (
+        "Убедитесь, что при удалении публикации её счётчик комментариев"
+        " не обновляется для каждого удаляемого комментария."
+    )
+
+
+def test_author_delete_updates_each_post_once(
+        mixer, another_user, published_category
+):
+    posts = mixer.cycle(2).blend(
+        "blog.Post", category=published_category
+    )
+    for post in posts:
+        mixer.cycle(3).blend("blog.Comment", post=post, author=another_user)
+    mixer.blend("blog.Comment", post=posts[0])
+
+    with CaptureQueriesContext(connection) as queries:
+        another_user.delete()
+
+    assert len(_post_updates(queries)) == 2, (
+        "Убедитесь, что при удалении автора комментариев счётчик каждой"
+        " публикации обновляется одним запросом."
+    )
+    assert dict(Post.objects.values_list("pk", "comment_count")) == {
+        posts[0].pk: 1, posts[1].pk: 0
+    }
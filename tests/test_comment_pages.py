@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from bs4 import BeautifulSoup
+
+from blog.constants import COMMENTS_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    return mixer.cycle(COMMENTS_PER_PAGE * 2 + 5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+
+
+def _comment_ids(content):
+    soup = BeautifulSoup(content.decode("utf-8"), features="html.parser")
+    return [
+        int(link["name"].split("_")[1])
+        for link in soup.find_all("a", attrs={"name": True})
+        if link["name"].startswith("comment_")
+    ]
+
+
+def test_post_page_renders_first_comment_page(
+        client, post_with_published_location, many_comments
+):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    assert _comment_ids(response.content) == [
+        comment.id for comment in many_comments[:COMMENTS_PER_PAGE]
+    ], (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " страница комментариев."
+    )
+    assert response.context["comment_page"].has_next()
+
+
+def test_comment_fragment_walks_whole_thread(
+        client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    page = client.get(f"/posts/{post.id}/").context["comment_page"]
+    seen = [comment.id for comment in page]
+    while page.has_next():
+        response = client.get(
+            f"/posts/{post.id}/comments/", {"comments": page.next_cursor}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert b"<form" not in response.content, (
+            "Убедитесь, что фрагмент комментариев не содержит формы."
+        )
+        seen.extend(_comment_ids(response.content))
+        page = response.context["comment_page"]
+    assert seen == [comment.id for comment in many_comments], (
+        "Убедитесь, что фрагменты комментариев выдают всю ветку"
+        " без пропусков и повторов."
+    )
+
+
+def test_comment_fragment_hides_unpublished_post(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,109 @@
+import csv
+import gzip
+import json
+from datetime import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Category, Comment, Location, Post
+
+
+@pytest.fixture
+def blog_content(mixer, user, published_category, published_location):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, title="Заголовок, с \"кавычками\"",
+    )
+    mixer.cycle(4).blend("blog.Comment", post=posts[0], author=user)
+    return posts
+
+
+def _posts():
+    # JSON хранит время с точностью до миллисекунд, как и dumpdata.
+    return [
+        {
+            name: value.replace(microsecond=value.microsecond // 1000 * 1000)
+            if isinstance(value, datetime) else value
+            for name, value in row.items()
+        }
+        for row in Post.objects.order_by("pk").values()
+    ]
+
+
+def _export(tmp_path, *args):
+    call_command("export_blog", str(tmp_path), *args, chunk_size=2,
+                 stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_export_jsonl_gzip(tmp_path, blog_content):
+    _export(tmp_path, "--gzip")
+    with gzip.open(tmp_path / "blog.post.jsonl.gz", "rt",
+                   encoding="utf-8") as stream:
+        rows = [json.loads(line) for line in stream]
+    assert [row["pk"] for row in rows] == sorted(
+        post.pk for post in blog_content
+    ), "Убедитесь, что выгружаются все публикации по одной в строке."
+    assert rows[0]["model"] == "blog.post"
+    assert rows[0]["fields"]["title"] == blog_content[0].title
+    for label, model in (
+        ("category", Category), ("location", Location), ("comment", Comment)
+    ):
+        with gzip.open(tmp_path / f"blog.{label}.jsonl.gz", "rt") as stream:
+            assert sum(1 for _ in stream) == model.objects.count()
+
+
+@pytest.mark.django_db
+def test_export_csv(tmp_path, blog_content):
+    _export(tmp_path, "--format", "csv", "--models", "comment")
+    assert not (tmp_path / "blog.post.csv").exists(), (
+        "Убедитесь, что выгружаются только выбранные модели."
+    )
+    with open(tmp_path / "blog.comment.csv", encoding="utf-8",
+              newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert len(rows) == 4
+    assert {row["post_id"] for row in rows} == {str(blog_content[0].pk)}
+
+
+@pytest.mark.django_db
+def test_export_csv_writes_json_fields(tmp_path, blog_content):
+    variants = {"image": "posts_images/a.png", "sizes": [
+        {"width": 320, "webp": "a-320.webp", "jpeg": "a-320.jpg"}
+    ]}
+    Post.objects.filter(pk=blog_content[0].pk).update(
+        image_variants=variants
+    )
+    _export(tmp_path, "--format", "csv", "--models", "post")
+    with open(tmp_path / "blog.post.csv", encoding="utf-8",
+              newline="") as stream:
+        rows = {int(row["id"]): row for row in csv.DictReader(stream)}
+    assert {
+        pk: json.loads(row["image_variants"]) for pk, row in rows.items()
+    } == dict(Post.objects.values_list("pk", "image_variants")), (
+        "Убедитесь, что поля JSON выгружаются в CSV как JSON."
+    )
+    assert json.loads(rows[blog_content[0].pk]["image_variants"]) == variants
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_loads_back(tmp_path, blog_content):
+    _export(tmp_path)
+    expected = _posts()
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+
+    call_command(
+        "bulk_loaddata",
+        *(str(tmp_path / f"blog.{label}.jsonl")
+          for label in ("category", "location", "post", "comment")),
+        stdout=StringIO(),
+    )
+    for row in expected:
+        row["comment_count"] = 4 if row["id"] == blog_content[0].pk else 0
+    assert _posts() == expected, (
+        "Убедитесь, что выгрузку можно загрузить командой bulk_loaddata."
+    )
+    assert Comment.objects.count() == 4
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.management.commands.generate_blog_data import Command
+from blog.models import Category, Comment, Location, Post, User
+from blog.utils import filter_published_posts
+
+
+@pytest.fixture
+def generate(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_THUMBNAIL_WIDTHS = (320,)
+
+    def run(**options):
+        options = {
+            "users": 5, "categories": 4, "locations": 3, "posts": 200,
+            "comments": 1000, "images": 2, "seed": 1, "batch_size": 64,
+            **options,
+        }
+        call_command("generate_blog_data", stdout=StringIO(), **options)
+    return run
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_blog_data(client, generate):
+    generate(future_share=0.2, hidden_share=0.2)
+
+    assert User.objects.count() == 5 and Category.objects.count() == 4
+    assert Post.objects.count() == 200 and Comment.objects.count() == 1000
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        "Убедитесь, что генератор создаёт отложенные публикации."
+    )
+    assert Post.objects.filter(is_published=False).exists()
+    with_images = Post.objects.exclude(image="").exclude(image_variants={})
+    assert with_images.exists(), (
+        "Убедитесь, что у части публикаций есть изображения с копиями."
+    )
+
+    per_category = sorted(
+        Post.objects.values("category").annotate(total=Count("id"))
+        .values_list("total", flat=True),
+        reverse=True,
+    )
+    assert per_category[0] > 2 * per_category[-1], (
+        "Убедитесь, что популярность категорий неравномерна."
+    )
+    counts = sorted(
+        Post.objects.values_list("comment_count", flat=True), reverse=True
+    )
+    assert sum(counts) == 1000, (
+        "Убедитесь, что после генерации пересчитано число комментариев."
+    )
+    assert counts[0] > 10 * counts[len(counts) // 2], (
+        "Убедитесь, что комментарии распределены по закону Ципфа."
+    )
+
+    post = filter_published_posts(Post.objects.exclude(image="")).first()
+    assert client.get("/").status_code == HTTPStatus.OK
+    assert client.get(f"/posts/{post.id}/").status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_blog_data_appends(generate):
+    # Тот же seed повторяет случайные названия: ключи всё равно новые.
+    for _ in range(2):
+        generate(images=0, image_share=0, locations=50)
+    assert Post.objects.count() == 400
+    assert Location.objects.count() == 100
+    assert User.objects.filter(username__startswith="load_user_").count() == 10
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_run_leaves_no_images(generate, tmp_path, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("Сбой генерации")
+
+    monkeypatch.setattr(Command, "create_comments", fail)
+    with pytest.raises(RuntimeError):
+        generate()
+    assert not Post.objects.exists()
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()], (
+        "Убедитесь, что после отката не остаётся изображений без ссылок."
+    )
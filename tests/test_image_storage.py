@@ -0,0 +1,138 @@
+import hashlib
+import os
+import time
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+from blog.tasks import delete_image_files
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _png(color="navy"):
+    buffer = BytesIO()
+    Image.new("RGB", (100, 80), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def _post_with(mixer, published_category, content, name="a.PNG"):
+    post = mixer.blend(
+        "blog.Post", category=published_category, is_published=True,
+        image=None,
+    )
+    post.image = SimpleUploadedFile(name, content, "image/png")
+    post.save()
+    post.refresh_from_db()
+    return post
+
+
+def test_upload_named_by_content(mixer, published_category):
+    content = _png()
+    digest = hashlib.sha256(content).hexdigest()
+    post = _post_with(mixer, published_category, content)
+    assert post.image.name == (
+        f"posts_images/{digest[:2]}/{digest[2:4]}/{digest}.png"
+    ), (
+        "Убедитесь, что изображение сохраняется под хэшем содержимого "
+        "в шардированном каталоге."
+    )
+
+
+def test_same_upload_stored_once(mixer, published_category, media_root):
+    content = _png()
+    first = _post_with(mixer, published_category, content, "one.png")
+    second = _post_with(mixer, published_category, content, "two.png")
+    assert first.image.name == second.image.name
+    assert len(list((media_root / "posts_images").rglob("*.png"))) == 1
+
+
+def test_file_deleted_with_last_reference(
+        mixer, published_category, media_root
+):
+    content = _png()
+    first = _post_with(mixer, published_category, content)
+    second = _post_with(mixer, published_category, content)
+    image_path = media_root / first.image.name
+    variants = [
+        media_root / size[key]
+        for size in first.image_variants["sizes"]
+        for key in ("webp", "jpeg")
+    ]
+
+    first.delete()
+    assert image_path.exists() and all(p.exists() for p in variants), (
+        "Убедитесь, что файл, на который ссылаются другие публикации, "
+        "не удаляется."
+    )
+    assert Post.objects.get(pk=second.pk).thumbnails
+
+    second.delete()
+    assert not image_path.exists(), (
+        "Убедитесь, что файл без ссылок удаляется вместе с публикацией."
+    )
+    assert not any(p.exists() for p in variants)
+
+
+def test_reupload_protects_file_from_collection(
+        mixer, published_category, media_root, settings
+):
+    settings.BLOG_IMAGE_GC_DELAY = 60
+    content = _png()
+    post = _post_with(mixer, published_category, content)
+    name = post.image.name
+    post.delete()
+    _age(media_root / name, 120)
+
+    # Загрузка того же содержимого: файл уже есть, публикация ещё
+    # не сохранена, и ссылок на файл нет.
+    storage = Post._meta.get_field("image").storage
+    assert storage.save("posts_images/b.png", ContentFile(content)) == name
+    delete_image_files(image=name, names=[])
+    assert (media_root / name).exists(), (
+        "Убедитесь, что только что загруженный повторно файл не удаляется"
+        " сборщиком."
+    )
+
+    _age(media_root / name, 120)
+    delete_image_files(image=name, names=[])
+    assert not (media_root / name).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replaced_original_collected_before_variants(
+        mixer, published_category, media_root, settings
+):
+    settings.TASKS_ALWAYS_EAGER = False
+    settings.BLOG_IMAGE_GC_DELAY = 0
+    post = _post_with(mixer, published_category, _png())
+    first = media_root / post.image.name
+    assert post.image_variants == {}
+
+    post.image = SimpleUploadedFile("b.png", _png("olive"), "image/png")
+    post.save()
+    second = media_root / post.image.name
+    post.image = None
+    post.save()
+    call_command("run_tasks", once=True, stdout=StringIO())
+
+    assert not first.exists() and not second.exists(), (
+        "Убедитесь, что заменённый или удалённый оригинал удаляется, даже"
+        " если копии для него ещё не готовы."
+    )
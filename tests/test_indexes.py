@@ -0,0 +1,51 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from blog.utils import filter_published_posts
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="План запроса проверяется только для SQLite.",
+    ),
+]
+
+
+def _plan(queryset):
+    return queryset.explain()
+
+
+def test_home_feed_uses_published_index(many_posts_with_published_locations):
+    plan = _plan(filter_published_posts(Post.objects.all())[:10])
+    assert "post_published_feed_idx" in plan, (
+        "Убедитесь, что лента главной страницы использует индекс"
+        f" `post_published_feed_idx`. План запроса:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        "Убедитесь, что сортировка ленты по `pub_date` берётся из индекса,"
+        f" без временной сортировки. План запроса:\n{plan}"
+    )
+
+
+def test_category_feed_uses_category_index(
+        published_category, many_posts_with_published_locations
+):
+    plan = _plan(filter_published_posts(
+        Post.objects.filter(category=published_category)
+    )[:10])
+    assert "post_category_feed_idx" in plan, (
+        "Убедитесь, что лента категории использует индекс"
+        f" `post_category_feed_idx`. План запроса:\n{plan}"
+    )
+
+
+def test_author_feed_uses_author_index(
+        user, many_posts_with_published_locations
+):
+    plan = _plan(user.posts.all()[:10])
+    assert "post_author_feed_idx" in plan, (
+        "Убедитесь, что лента автора использует индекс"
+        f" `post_author_feed_idx`. План запроса:\n{plan}"
+    )
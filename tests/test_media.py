@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+
+DIGEST = "ab" * 32
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_MEDIA_ACCEL_REDIRECT = None
+    (tmp_path / "posts_images" / "ab" / "ab").mkdir(parents=True)
+    (tmp_path / "posts_images" / "ab" / "ab" / f"{DIGEST}.png").write_bytes(
+        CONTENT
+    )
+    (tmp_path / "plain.png").write_bytes(CONTENT)
+    return tmp_path
+
+
+HASHED_URL = f"/media/posts_images/ab/ab/{DIGEST}.png"
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+def test_full_file_served_with_validators(client):
+    response = client.get("/media/plain.png")
+    assert response.status_code == HTTPStatus.OK
+    assert _body(response) == CONTENT
+    assert response["Content-Type"] == "image/png"
+    assert response["ETag"].startswith('W/"')
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" not in response["Cache-Control"]
+
+
+def test_hashed_file_cached_forever(client):
+    response = client.get(HASHED_URL)
+    assert response["ETag"] == f'"{DIGEST}.png"'
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хэшем в имени кэшируются как неизменяемые."
+    )
+
+
+@pytest.mark.parametrize("url", [HASHED_URL, "/media/plain.png"])
+def test_if_none_match_returns_304(client, url):
+    etag = client.get(url)["ETag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что при совпадении ETag возвращается статус 304."
+    )
+    assert not response.content
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=1000-", (1000, 1023)),
+        ("bytes=-24", (1000, 1023)),
+        ("bytes=1020-5000", (1020, 1023)),
+    ],
+)
+def test_range_request(client, header, expected):
+    response = client.get(HASHED_URL, headers={"Range": header})
+    start, end = expected
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert _body(response) == CONTENT[start:end + 1]
+    assert response["Content-Range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert int(response["Content-Length"]) == end - start + 1
+
+
+def test_unsatisfiable_range(client):
+    response = client.get(HASHED_URL, headers={"Range": "bytes=5000-"})
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_if_range_mismatch_serves_whole_file(client):
+    response = client.get(
+        HASHED_URL, headers={"Range": "bytes=0-9", "If-Range": '"other"'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert _body(response) == CONTENT
+
+
+@pytest.mark.parametrize(
+    "url", ["/media/missing.png", "/media/../settings.py", "/media/"]
+)
+def test_missing_or_outside_files(client, url):
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_accel_redirect(client, settings):
+    settings.BLOG_MEDIA_ACCEL_REDIRECT = "/protected-media/"
+    response = client.get(HASHED_URL)
+    assert response["X-Accel-Redirect"] == (
+        f"/protected-media/posts_images/ab/ab/{DIGEST}.png"
+    )
+    assert not response.content
+    assert "immutable" in response["Cache-Control"]
@@ -0,0 +1,165 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.caching import home_feed, page_cache_timeout
+from blog.clock import granularity
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_feed_is_served_from_cache(
+        client, django_assert_num_queries, post_with_published_location
+):
+    first = client.get("/")
+    assert first.status_code == HTTPStatus.OK
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content, (
+        "Убедитесь, что анонимному посетителю повторно отдаётся"
+        " закэшированная страница ленты."
+    )
+
+
+def test_page_cache_keys_include_page_number(
+        client, many_posts_with_published_locations
+):
+    first = client.get("/")
+    second = client.get("/?page=2")
+    assert first.content != second.content, (
+        "Убедитесь, что страницы ленты кэшируются отдельно для каждой"
+        " страницы пагинации."
+    )
+
+
+def test_comment_invalidates_cached_post_page(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    mixer.blend("blog.Comment", post=post, text="Свежий комментарий")
+    assert "Свежий комментарий" in client.get(url).content.decode(), (
+        "Убедитесь, что новый комментарий сбрасывает кэш страницы публикации."
+    )
+
+
+def test_post_change_invalidates_cached_feeds(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        client.get(url)
+    post.title = "Обновлённый заголовок"
+    post.save()
+    for url in urls:
+        assert post.title in client.get(url).content.decode(), (
+            f"Убедитесь, что изменение публикации сбрасывает кэш `{url}`."
+        )
+
+
+def test_post_save_does_not_load_category_and_author(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/"
+    client.get(url)
+    post = Post.objects.get(pk=post.pk)
+    post.title = "Заголовок без лишних запросов"
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    joined = " ".join(query["sql"] for query in queries)
+    assert 'FROM "blog_category"' not in joined, (
+        "Убедитесь, что сброс кэша не загружает категорию публикации."
+    )
+    assert 'FROM "auth_user"' not in joined, (
+        "Убедитесь, что сброс кэша не загружает автора публикации."
+    )
+    assert post.title in client.get(url).content.decode()
+
+
+def test_post_moved_by_id_invalidates_new_category_page(
+        mixer, client, django_capture_on_commit_callbacks,
+        post_with_published_location
+):
+    post = post_with_published_location
+    category = mixer.blend("blog.Category", is_published=True)
+    url = f"/category/{category.slug}/"
+    client.get(url)
+    post = Post.objects.get(pk=post.pk)
+    post.category_id = category.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert post.title in client.get(url).content.decode(), (
+        "Убедитесь, что перенос публикации в другую категорию сбрасывает"
+        " кэш страницы новой категории."
+    )
+
+
+def test_post_delete_cost_does_not_grow_with_comments(
+        mixer, published_category
+):
+    def delete_with(comments):
+        post = mixer.blend("blog.Post", category=published_category)
+        mixer.cycle(comments).blend("blog.Comment", post=post)
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        return len(queries)
+
+    assert delete_with(20) == delete_with(1), (
+        "Убедитесь, что число запросов при удалении публикации не зависит"
+        " от числа её комментариев."
+    )
+
+
+def test_comment_queryset_delete_invalidates_post_once(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, text="Старый комментарий")
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        Comment.objects.filter(post=post).delete()
+    selects = [query for query in queries
+               if '"blog_category"."slug"' in query["sql"]]
+    assert len(selects) == 1, (
+        "Убедитесь, что страницы публикации сбрасываются один раз на"
+        " публикацию, а не на каждый комментарий."
+    )
+    assert "Старый комментарий" not in client.get(url).content.decode()
+
+
+def test_authenticated_users_bypass_cache(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None, (
+        "Убедитесь, что авторизованным пользователям страница"
+        " не отдаётся из кэша."
+    )
+
+
+def test_scheduled_post_limits_cache_timeout(mixer, published_category):
+    mixer.blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert page_cache_timeout(home_feed()) <= 30 + granularity(), (
+        "Убедитесь, что страница не кэшируется дольше момента ближайшей"
+        " отложенной публикации."
+    )
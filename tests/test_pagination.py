@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.utils.html import escape
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _walk_cursor_pages(client, url):
+    pages = []
+    response = client.get(url, {"cursor": ""})
+    while True:
+        assert response.status_code == HTTPStatus.OK, (
+            "Убедитесь, что страницы ленты с курсором загружаются без ошибок."
+        )
+        page = response.context["page_obj"]
+        pages.append(page)
+        if not page.has_next():
+            return pages
+        response = client.get(url, {"cursor": page.next_cursor})
+
+
+@pytest.mark.parametrize("url", ["/", "category", "profile"])
+def test_cursor_pagination_walks_whole_feed(
+        user_client, user, published_category,
+        many_posts_with_published_locations, url
+):
+    url = {
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }.get(url, url)
+    posts = many_posts_with_published_locations
+
+    pages = _walk_cursor_pages(user_client, url)
+
+    seen = [post for page in pages for post in page]
+    assert all(len(page) <= N_PER_PAGE for page in pages), (
+        "Убедитесь, что на странице с курсором не больше "
+        f"{N_PER_PAGE} публикаций."
+    )
+    assert [post.id for post in seen] == [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True
+        )
+    ], (
+        "Убедитесь, что keyset-пагинация проходит по всей ленте "
+        "«от новых к старым» без пропусков и повторов."
+    )
+
+
+def test_cursor_pagination_previous_page(
+        user_client, many_posts_with_published_locations
+):
+    first, second = _walk_cursor_pages(user_client, "/")[:2]
+    assert not first.has_previous()
+    response = user_client.get("/", {"cursor": second.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in first
+    ], "Убедитесь, что ссылка «назад» возвращает на предыдущую страницу."
+
+
+def test_cursor_pagination_invalid_cursor(user_client):
+    response = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что некорректный курсор приводит к ошибке 404."
+    )
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        q["sql"] for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT COUNT(*)")
+    ]
+
+
+def test_feed_count_is_cached_and_invalidated(
+        mixer, user_client, published_category,
+        many_posts_with_published_locations
+):
+    assert _count_queries(user_client, "/"), (
+        "Первый запрос ленты должен посчитать число публикаций."
+    )
+    assert not _count_queries(user_client, "/"), (
+        "Убедитесь, что число публикаций ленты берётся из кэша."
+    )
+
+    mixer.blend("blog.Post", category=published_category, is_published=True)
+    assert _count_queries(user_client, "/"), (
+        "Убедитесь, что сохранение публикации сбрасывает кэш числа страниц."
+    )
+    response = user_client.get("/")
+    assert response.context["paginator"].count == len(
+        many_posts_with_published_locations
+    ) + 1
+
+
+def test_cursor_links_keep_other_parameters(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/", {"cursor": "", "utm_source": "mail"})
+    page = response.context["page_obj"]
+    next_query = QueryDict(page.next_query)
+    assert next_query["utm_source"] == "mail", (
+        "Убедитесь, что ссылки курсорной пагинации сохраняют остальные "
+        "параметры запроса."
+    )
+    assert next_query["cursor"] == page.next_cursor
+    assert f'href="?{escape(page.next_query)}"' in response.content.decode()
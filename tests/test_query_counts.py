@@ -0,0 +1,97 @@
+import pytest
+from django.test import override_settings
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("comment_to_a_post"),
+]
+
+# Запросы сессии и пользователя у авторизованного клиента.
+AUTH_QUERIES = 2
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_post_detail_queries_anonymous(
+        client, django_assert_num_queries, post_with_published_location
+):
+    # Публикация со всеми связями и страница комментариев.
+    with django_assert_num_queries(2):
+        client.get(f"/posts/{post_with_published_location.id}/")
+
+
+def test_post_detail_queries_author(
+        user_client, django_assert_num_queries, post_with_published_location
+):
+    with django_assert_num_queries(AUTH_QUERIES + 2):
+        user_client.get(f"/posts/{post_with_published_location.id}/")
+
+
+def test_delete_post_page_loads_object_once(
+        user_client, django_assert_num_queries, post_with_published_location
+):
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        user_client.get(f"/posts/{post_with_published_location.id}/delete/")
+
+
+def test_comment_edit_pages_load_object_once(
+        user_client, user, django_assert_num_queries, comment_to_a_post
+):
+    comment = comment_to_a_post
+    comment.author = user
+    comment.save()
+    base = f"/posts/{comment.post_id}/comments/{comment.id}"
+    for url in (f"{base}/edit/", f"{base}/delete/"):
+        with django_assert_num_queries(AUTH_QUERIES + 1):
+            user_client.get(url)
+
+
+def test_not_owner_is_redirected_from_comment_edit(
+        another_user_client, comment_to_a_post
+):
+    comment = comment_to_a_post
+    base = f"/posts/{comment.post_id}/comments/{comment.id}"
+    for url in (f"{base}/edit/", f"{base}/delete/"):
+        response = another_user_client.get(url)
+        assert response.status_code == 302
+        assert response.url == f"/posts/{comment.post_id}/", (
+            "Убедитесь, что чужой комментарий нельзя изменить или удалить:"
+            " пользователь перенаправляется на страницу публикации."
+        )
+
+
+def test_missing_object_gives_404(user_client):
+    assert user_client.get("/posts/999999/edit/").status_code == 404
+    assert user_client.get(
+        "/posts/999999/comments/999999/delete/"
+    ).status_code == 404
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_category_and_profile_resolved_once(
+        client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        # Категория или автор, число публикаций, ближайшая отложенная
+        # публикация и сама страница ленты.
+        with django_assert_num_queries(4):
+            client.get(url)
+        # Число публикаций и расписание берутся из кэша.
+        with django_assert_num_queries(2):
+            client.get(url)
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_renamed_category_is_resolved_again(
+        client, post_with_published_location
+):
+    category = post_with_published_location.category
+    old_slug = category.slug
+    assert client.get(f"/category/{old_slug}/").status_code == 200
+    category.slug = f"{old_slug}-new"
+    category.save()
+    assert client.get(f"/category/{old_slug}/").status_code == 404
+    assert client.get(f"/category/{category.slug}/").status_code == 200
@@ -0,0 +1,160 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.middleware import ReadReplicaMiddleware
+from blog.models import Post
+from blog.routers import ReadReplicaRouter
+
+
+@pytest.fixture
+def replica_settings(tmp_path):
+    # Реплика — отдельный файл SQLite, а не ещё одно имя основной базы.
+    databases = connections.configure_settings({
+        **settings.DATABASES,
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": str(tmp_path / "replica.sqlite3"),
+        },
+    })
+    with override_settings(DATABASES=databases):
+        yield databases["replica"]
+
+
+@pytest.fixture
+def replicate(request, replica_settings):
+    """Подключает реплику и возвращает функцию снимка основной базы.
+
+    Между снимками реплика отстаёт от основной базы, как при
+    асинхронной репликации.
+    """
+    connections.settings["replica"] = replica_settings
+    # Доступ к базам открывается после того, как реплика появилась
+    # в списке подключений.
+    request.applymarker(pytest.mark.django_db(
+        transaction=True, databases=["default", "replica"]
+    ))
+    request.getfixturevalue("transactional_db")
+
+    def snapshot():
+        source, target = connections["default"], connections["replica"]
+        source.ensure_connection()
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+
+    yield snapshot
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+def _read_db(method="get", cookies=None, replica_view=True):
+    seen = []
+
+    def view(request):
+        seen.append(ReadReplicaRouter().db_for_read(Post))
+        return HttpResponse()
+
+    view.use_read_replica = replica_view
+    request = getattr(RequestFactory(), method)("/")
+    request.COOKIES.update(cookies or {})
+    middleware = ReadReplicaMiddleware(
+        lambda request: middleware.process_view(request, view, (), {})
+        or view(request)
+    )
+    response = middleware(request)
+    return seen[0], response
+
+
+@pytest.mark.usefixtures("replica_settings")
+def test_read_only_views_use_replica():
+    db, _ = _read_db()
+    assert db == "replica", (
+        "Убедитесь, что представления с `use_read_replica` читают "
+        "из реплики."
+    )
+    db, _ = _read_db(replica_view=False)
+    assert db is None
+
+
+@pytest.mark.usefixtures("replica_settings")
+def test_write_makes_reads_sticky():
+    db, response = _read_db("post")
+    assert db is None
+    cookie = response.cookies[settings.BLOG_REPLICA_STICKY_COOKIE]
+    assert cookie["max-age"] == settings.BLOG_REPLICA_STICKY_SECONDS
+
+    db, _ = _read_db(
+        cookies={settings.BLOG_REPLICA_STICKY_COOKIE: cookie.value}
+    )
+    assert db is None, (
+        "Убедитесь, что после записи посетитель читает из основной базы, "
+        "пока жива cookie."
+    )
+
+
+def test_no_replica_configured():
+    db, _ = _read_db()
+    assert db is None
+
+
+@pytest.mark.django_db
+def test_comment_sets_sticky_cookie(user_client, post_with_published_location):
+    response = user_client.post(
+        f"/posts/{post_with_published_location.id}/comment/",
+        {"text": "Новый комментарий"},
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert settings.BLOG_REPLICA_STICKY_COOKIE in response.cookies
+
+
+def test_users_and_sessions_read_from_primary():
+    router = ReadReplicaRouter()
+    User = get_user_model()
+    assert router.db_for_read(User) == "default"
+
+
+def test_read_after_write(
+        replicate, user_client, client, post_with_published_location
+):
+    post = post_with_published_location
+    replicate()
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Свежий комментарий"}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+
+    page = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert "Свежий комментарий" in page, (
+        "Убедитесь, что после записи посетитель сразу видит её, даже если"
+        " реплика отстаёт."
+    )
+    assert "Свежий комментарий" not in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode(), "Убедитесь, что другие посетители читают из реплики."
+
+    # Когда cookie истекла, чтения снова идут на догнавшую реплику.
+    replicate()
+    del user_client.cookies[settings.BLOG_REPLICA_STICKY_COOKIE]
+    assert "Свежий комментарий" in user_client.get(
+        f"/posts/{post.id}/"
+    ).content.decode()
+
+
+def test_login_is_read_from_primary(
+        replicate, mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    replicate()
+    # Ни пользователя, ни его сессии на реплике ещё нет.
+    user = mixer.blend(get_user_model())
+    client.force_login(user)
+    response = client.get(f"/posts/{post.id}/")
+    assert response.context["user"] == user, (
+        "Убедитесь, что пользователь и сессия читаются из основной базы."
+    )
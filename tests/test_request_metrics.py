@@ -0,0 +1,43 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_metrics_disabled_by_default(client):
+    response = client.get("/")
+    assert "Server-Timing" not in response, (
+        "Убедитесь, что замер запросов выключен, пока не задана настройка "
+        "`BLOG_REQUEST_METRICS`."
+    )
+
+
+@override_settings(BLOG_REQUEST_METRICS=True, BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_metrics_logged_and_sent_in_header(
+        client, caplog, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    with caplog.at_level(logging.INFO, logger="blog.metrics"):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+    records = [r for r in caplog.records if r.name == "blog.metrics"]
+    assert len(records) == 1, (
+        "Убедитесь, что на каждый запрос пишется одна строка метрик."
+    )
+    metrics = records[0].metrics
+    assert metrics["view"] == "blog:post_detail"
+    assert metrics["status"] == HTTPStatus.OK
+    assert metrics["queries"] >= 1
+    assert metrics["render_ms"] > 0
+    assert metrics["total_ms"] >= metrics["render_ms"]
+
+    header = response["Server-Timing"]
+    for part in ("db;dur=", f'desc="{metrics["queries"]} queries"',
+                 "render;dur=", "total;dur="):
+        assert part in header, (
+            f"Убедитесь, что заголовок Server-Timing содержит `{part}`."
+        )
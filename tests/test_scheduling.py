@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.caching import author_feed, category_feed, home_feed
+from blog.clock import granularity, visible_at
+from blog.scheduling import limit_timeout, next_publication
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=5),
+    )
+
+
+def test_next_publication_per_feed(
+        scheduled_post, another_category, another_user
+):
+    post = scheduled_post
+    for feed in (
+        home_feed(),
+        category_feed(post.category_id),
+        author_feed(post.author_id),
+    ):
+        assert next_publication(feed) == visible_at(post.pub_date), (
+            "Убедитесь, что индекс отложенных публикаций находит ближайшую"
+            f" публикацию ленты `{feed}`."
+        )
+    for feed in (
+        category_feed(another_category.id),
+        author_feed(another_user.id),
+        author_feed(post.author_id, with_hidden=True),
+    ):
+        assert next_publication(feed) is None, (
+            f"Убедитесь, что лента `{feed}` не зависит от чужих"
+            " отложенных публикаций."
+        )
+
+
+def test_limit_timeout(scheduled_post):
+    assert limit_timeout(3600, home_feed()) <= 5 * 60 + granularity()
+    assert limit_timeout(60, home_feed()) == 60
+    assert limit_timeout(3600, None) == 3600
+
+
+def test_schedule_follows_post_changes(scheduled_post):
+    assert next_publication(home_feed()) == visible_at(
+        scheduled_post.pub_date
+    )
+    scheduled_post.is_published = False
+    scheduled_post.save()
+    assert next_publication(home_feed()) is None, (
+        "Убедитесь, что изменение публикации сбрасывает индекс"
+        " отложенных публикаций."
+    )
+
+
+def test_passed_publication_is_replaced(scheduled_post, mixer):
+    later = mixer.blend(
+        "blog.Post",
+        category=scheduled_post.category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert next_publication(home_feed()) == visible_at(
+        scheduled_post.pub_date
+    )
+    scheduled_post.pub_date = timezone.now() - timedelta(seconds=1)
+    scheduled_post.save()
+    assert next_publication(home_feed()) == visible_at(later.pub_date)
@@ -0,0 +1,149 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from search.backends import (
+    BaseSearchBackend,
+    FTS5SearchBackend,
+    LikeSearchBackend,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, published_category):
+    def blend(title, text="", **kwargs):
+        fields = {
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend(
+            "blog.Post", title=title, text=text, category=published_category,
+            **fields,
+        )
+    return {
+        "in_title": blend("Прогулка по Москве", "Заметки"),
+        "in_text": blend("Выходные", "Долгая прогулка вдоль реки"),
+        "other": blend("Рецепт", "Пирог с яблоками"),
+        "hidden": blend("Прогулка", "Черновик", is_published=False),
+        "future": blend(
+            "Прогулка", "Позже", pub_date=timezone.now() + timedelta(days=1)
+        ),
+    }
+
+
+def _search(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_and_respects_publication(client, posts):
+    assert _search(client, "прогулка") == [
+        posts["in_title"].id, posts["in_text"].id
+    ], (
+        "Убедитесь, что поиск находит только опубликованные публикации, "
+        "а совпадения в заголовке выше совпадений в тексте."
+    )
+
+
+def test_search_index_follows_changes(client, posts):
+    post = posts["other"]
+    post.title = "Прогулка с пирогом"
+    post.save()
+    assert post.id in _search(client, "прогулка")
+
+    post.delete()
+    assert post.id not in _search(client, "прогулка"), (
+        "Убедитесь, что удалённая публикация пропадает из индекса."
+    )
+
+
+def test_prefix_and_hostile_queries(client, posts):
+    assert _search(client, "прогул") == [
+        posts["in_title"].id, posts["in_text"].id
+    ]
+    assert _search(client, '" OR * NEAR(') == []
+    assert _search(client, "") == []
+
+
+@pytest.mark.parametrize("backend", [FTS5SearchBackend, LikeSearchBackend])
+def test_backends_agree(posts, backend):
+    from blog.models import Post
+
+    found = backend().search(Post.objects.filter(is_published=True), "Пирог")
+    assert [post.id for post in found] == [posts["other"].id]
+
+
+def test_search_paginates_with_query(client, mixer, published_category):
+    mixer.cycle(12).blend(
+        "blog.Post", title="Море", category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    response = client.get("/search/", {"q": "море"})
+    assert "?q=%D0%BC%D0%BE%D1%80%D0%B5&amp;page=2" in response.content.decode()
+
+
+def test_search_matches_word_forms(client, posts):
+    assert _search(client, "прогулки") == [
+        posts["in_title"].id, posts["in_text"].id
+    ], "Убедитесь, что поиск находит другие словоформы запроса."
+    assert _search(client, "москва") == [posts["in_title"].id]
+    assert _search(client, "яблоко пироги") == [posts["other"].id]
+
+
+def test_analysis_normalizes_words():
+    from search.analysis import analyze
+
+    assert analyze("Ёлки, ЁЛКАМИ и Running dogs") == "елк елк и run dog"
+
+
+def test_fixture_posts_are_indexed(client, tmp_path):
+    fixture = tmp_path / "posts.json"
+    fixture.write_text(json.dumps([
+        {"model": "auth.user", "pk": 70, "fields": {"username": "loader"}},
+        {
+            "model": "blog.category",
+            "pk": 70,
+            "fields": {
+                "title": "Фикстуры",
+                "description": "Описание",
+                "slug": "fixtures",
+                "is_published": True,
+                "created_at": "2024-01-01T00:00:00Z",
+            },
+        },
+        {
+            "model": "blog.post",
+            "pk": 70,
+            "fields": {
+                "title": "Прогулка из фикстуры",
+                "text": "Текст",
+                "pub_date": "2024-01-01T00:00:00Z",
+                "author": 70,
+                "category": 70,
+                "is_published": True,
+                "created_at": "2024-01-01T00:00:00Z",
+            },
+        },
+    ]), encoding="utf-8")
+    call_command("loaddata", str(fixture), stdout=StringIO())
+    assert _search(client, "прогулки") == [70], (
+        "Убедитесь, что публикации, загруженные loaddata, попадают"
+        " в поисковый индекс."
+    )
+
+
+def test_backend_must_implement_search():
+    class IndexOnly(BaseSearchBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        IndexOnly()
@@ -0,0 +1,47 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from blog.sqlite import configure_connection
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_django_connection():
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        busy_timeout, = cursor.fetchone()
+        cursor.execute("PRAGMA cache_size")
+        cache_size, = cursor.fetchone()
+    assert busy_timeout == settings.BLOG_SQLITE_PRAGMAS["busy_timeout"], (
+        "Убедитесь, что прагмы из `BLOG_SQLITE_PRAGMAS` применяются "
+        "к каждому новому соединению."
+    )
+    assert cache_size == settings.BLOG_SQLITE_PRAGMAS["cache_size"]
+
+
+def test_wal_on_file_database(tmp_path):
+    raw = sqlite3.connect(tmp_path / "db.sqlite3")
+    configure_connection(raw, {"journal_mode": "wal"})
+    assert raw.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    raw.close()
+
+
+def test_invalid_pragma_rejected():
+    raw = sqlite3.connect(":memory:")
+    with pytest.raises(ValueError):
+        configure_connection(raw, {"cache_size": "1; DROP TABLE post"})
+    raw.close()
+
+
+def test_benchmark_command_reports_both_runs():
+    out = StringIO()
+    call_command(
+        "benchmark_sqlite", duration=0.2, readers=1, writers=1, posts=5,
+        stdout=out,
+    )
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2 and all("записей" in line for line in lines)
@@ -0,0 +1,160 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail import send_mail
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from taskqueue.models import Task
+from taskqueue.registry import enqueue, enqueue_later, task
+
+calls = []
+
+
+@task(name="tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task(name="tests.fail", max_attempts=2)
+def fail():
+    raise RuntimeError("Ошибка задачи")
+
+
+@pytest.fixture(autouse=True)
+def queued(settings):
+    settings.TASKS_ALWAYS_EAGER = False
+    calls.clear()
+
+
+def _run_worker(**options):
+    call_command("run_tasks", once=True, stdout=StringIO(),
+                 **options)
+
+
+@pytest.mark.django_db
+def test_eager_mode_runs_immediately(settings):
+    settings.TASKS_ALWAYS_EAGER = True
+    assert enqueue(record, value=1) is None
+    assert calls == [1] and not Task.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("workers", [1, 3])
+def test_worker_runs_and_removes_tasks(workers):
+    for value in range(5):
+        enqueue(record, value=value)
+    assert not calls, "Убедитесь, что задача не выполняется в запросе."
+
+    _run_worker(pool="thread", workers=workers)
+
+    assert sorted(calls) == list(range(5))
+    assert not Task.objects.exists(), (
+        "Убедитесь, что выполненные задачи удаляются из очереди."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_delayed_task_waits():
+    enqueue_later(60, record, value="later")
+    _run_worker()
+    assert not calls, (
+        "Убедитесь, что отложенная задача не выполняется раньше срока."
+    )
+    Task.objects.update(run_after=timezone.now())
+    _run_worker()
+    assert calls == ["later"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_task_retried_then_marked_failed():
+    queued_task = enqueue(fail)
+
+    _run_worker()
+    queued_task.refresh_from_db()
+    assert queued_task.status == Task.Status.PENDING
+    assert queued_task.attempts == 1
+    assert queued_task.run_after > timezone.now(), (
+        "Убедитесь, что упавшая задача повторяется с задержкой."
+    )
+    assert "Ошибка задачи" in queued_task.last_error
+
+    Task.objects.update(run_after=timezone.now())
+    _run_worker()
+    queued_task.refresh_from_db()
+    assert queued_task.status == Task.Status.FAILED
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_running_task_requeued(settings):
+    queued_task = enqueue(record, value="stale")
+    Task.objects.update(
+        status=Task.Status.RUNNING,
+        locked_at=timezone.now() - timedelta(
+            seconds=settings.TASKS_LOCK_TIMEOUT + 1
+        ),
+    )
+    _run_worker()
+    assert calls == ["stale"]
+    assert not Task.objects.filter(pk=queued_task.pk).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_task_without_attempts_marked_failed(settings):
+    queued_task = enqueue(fail)
+    Task.objects.update(
+        status=Task.Status.RUNNING,
+        attempts=queued_task.max_attempts,
+        locked_at=timezone.now() - timedelta(
+            seconds=settings.TASKS_LOCK_TIMEOUT + 1
+        ),
+    )
+    _run_worker()
+    queued_task.refresh_from_db()
+    assert queued_task.status == Task.Status.FAILED, (
+        "Убедитесь, что зависшая задача без оставшихся попыток помечается"
+        " неудавшейся, а не возвращается в очередь."
+    )
+    assert queued_task.attempts == queued_task.max_attempts
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_survives_pool_errors(monkeypatch, caplog):
+    def broken_execute(pk):
+        raise RuntimeError("Сбой воркера")
+
+    monkeypatch.setattr(
+        "taskqueue.management.commands.run_tasks.execute", broken_execute
+    )
+    enqueue(record, value=1)
+    enqueue(record, value=2)
+    _run_worker(workers=2)
+    errors = [entry.exc_info[1] for entry in caplog.records
+              if entry.exc_info]
+    assert [str(error) for error in errors] == ["Сбой воркера"] * 2, (
+        "Убедитесь, что ошибка каждой задачи пула записывается в журнал"
+        " и не останавливает воркер."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(
+    EMAIL_BACKEND="taskqueue.mail.QueuedEmailBackend",
+    TASKS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+def test_queued_email_sent_by_worker():
+    send_mail("Тема", "Текст", "from@example.com", ["to@example.com"])
+    assert not mail.outbox, (
+        "Убедитесь, что письмо не отправляется в запросе, а ставится "
+        "в очередь."
+    )
+    assert Task.objects.filter(name="taskqueue.send_email").exists()
+
+    _run_worker()
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].subject == "Тема"
+    assert mail.outbox[0].to == ["to@example.com"]
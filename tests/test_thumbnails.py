@@ -0,0 +1,119 @@
+import hashlib
+import re
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _upload(width=1200, height=800, name="photo.png", color="teal"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/png")
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_THUMBNAIL_WIDTHS = (320, 640, 960)
+    return tmp_path
+
+
+@pytest.fixture
+def post_with_image(post_with_published_location):
+    post = post_with_published_location
+    post.image = _upload()
+    post.save()
+    post.refresh_from_db()
+    return post
+
+
+def test_variants_generated_on_upload(post_with_image, media_root):
+    variants = Post.objects.get(pk=post_with_image.pk).image_variants
+    assert (variants["width"], variants["height"]) == (1200, 800)
+    assert [size["width"] for size in variants["sizes"]] == [320, 640, 960], (
+        "Убедитесь, что при загрузке изображения создаются уменьшенные "
+        "копии всех ширин из `BLOG_THUMBNAIL_WIDTHS`."
+    )
+    for size in variants["sizes"]:
+        for key, image_format in (("webp", "WEBP"), ("jpeg", "JPEG")):
+            with Image.open(media_root / size[key]) as image:
+                assert image.format == image_format
+                assert image.size == (size["width"], size["height"])
+
+
+def test_small_image_is_not_upscaled(post_with_published_location):
+    post = post_with_published_location
+    post.image = _upload(200, 100)
+    post.save()
+    post.refresh_from_db()
+    assert [
+        (size["width"], size["height"])
+        for size in post.image_variants["sizes"]
+    ] == [(200, 100)]
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_feed_uses_srcset(client, post_with_image):
+    content = client.get("/").content.decode()
+    thumbs = post_with_image.thumbnails
+    assert thumbs.webp_srcset in content and thumbs.jpeg_srcset in content, (
+        "Убедитесь, что карточка публикации выводит уменьшенные копии "
+        "изображения через `srcset`."
+    )
+    assert f'src="{thumbs.src}"' in content
+    assert f'src="{post_with_image.image.url}"' not in content, (
+        "Убедитесь, что в ленте не загружается оригинал изображения."
+    )
+
+
+def test_stale_variants_deleted(post_with_image, media_root):
+    old_files = [
+        media_root / size[key]
+        for size in post_with_image.image_variants["sizes"]
+        for key in ("webp", "jpeg")
+    ]
+    post = Post.objects.get(pk=post_with_image.pk)
+    post.image = _upload(name="other.png", color="olive")
+    post.save()
+    post.refresh_from_db()
+    assert not any(path.exists() for path in old_files), (
+        "Убедитесь, что при замене изображения старые копии удаляются."
+    )
+
+    new_files = [
+        media_root / size[key]
+        for size in post.image_variants["sizes"]
+        for key in ("webp", "jpeg")
+    ]
+    post.image = None
+    post.save()
+    assert Post.objects.get(pk=post.pk).image_variants == {}
+    assert not any(path.exists() for path in new_files)
+
+
+def test_exif_stripped_from_original(post_with_published_location,
+                                     media_root):
+    exif = Image.Exif()
+    exif[0x010F] = "Камера"
+    buffer = BytesIO()
+    Image.new("RGB", (400, 300), "teal").save(buffer, "JPEG", exif=exif)
+    post = post_with_published_location
+    digest = hashlib.sha256(buffer.getvalue()).hexdigest()
+    post.image = SimpleUploadedFile("exif.jpg", buffer.getvalue())
+    post.save()
+    post.refresh_from_db()
+    with Image.open(media_root / post.image.name) as image:
+        assert not image.getexif(), (
+            "Убедитесь, что из загруженного изображения удаляются EXIF."
+        )
+    assert re.fullmatch(r"posts_images/\w\w/\w\w/\w{64}\.jpg", post.image.name)
+    assert not list(media_root.rglob(f"{digest}.jpg")), (
+        "Убедитесь, что оригинал с EXIF удаляется после обработки."
+    )